@@ -54,6 +54,7 @@ class EntityDictionaryCache:
             self._countries: frozenset[str] | None = None
             self._organisations: frozenset[str] | None = None
             self._english_corpus: frozenset[str] | None = None
+            self._all_places: frozenset[str] | None = None
             self._initialized = True
 
     @property
@@ -93,8 +94,12 @@ class EntityDictionaryCache:
         return self._english_corpus
 
     def get_all_places(self) -> frozenset[str]:
-        """Get combined cities and countries set."""
-        return self.cities | self.countries
+        """Get combined cities and countries set, built once on first use."""
+        if self._all_places is None:
+            with self._lock:
+                if self._all_places is None:
+                    self._all_places = self.cities | self.countries
+        return self._all_places
 
     def is_place(self, text_lower: str) -> bool:
         """O(1) lookup for place entities."""
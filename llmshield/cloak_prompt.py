@@ -23,8 +23,35 @@ from collections import OrderedDict
 
 # Local Imports
 from .entity_detector import Entity, EntityConfig, EntityDetector
+from .lru_cache import LRUCache
 from .utils import wrap_entity
 
+# Longer prompts are never cached, which bounds the size of each cache entry
+MAX_CACHED_PROMPT_LENGTH = 10_000
+
+
+def _detect_entities(
+    prompt: str,
+    entity_config: EntityConfig | None = None,
+    cache: LRUCache | None = None,
+) -> set[Entity]:
+    """Detect the entities in a prompt for the configured entity types.
+
+    Detection only depends on the prompt, the enabled types and the static
+    dictionaries, so when the caller passes a cache, repeated prompts
+    (e.g. shared system prompts) are served from it.
+    """
+    entity_config = entity_config or EntityConfig()
+    cacheable = cache is not None and len(prompt) <= MAX_CACHED_PROMPT_LENGTH
+    key = (prompt, entity_config.enabled_types)
+    if cacheable and (entities := cache.get(key)) is not None:
+        return set(entities)
+
+    entities = EntityDetector(entity_config).detect_entities(prompt)
+    if cacheable:
+        cache.put(key, frozenset(entities))
+    return entities
+
 
 # pylint: disable=too-many-locals
 def cloak_prompt(  # noqa: PLR0913
@@ -34,6 +61,7 @@ def cloak_prompt(  # noqa: PLR0913
     entity_map: dict[str, str] | None = None,
     entity_config: EntityConfig | None = None,
     allowlist: frozenset[str] | None = None,
+    cache: LRUCache | None = None,
 ) -> tuple[str, dict[str, str]]:
     """Cloak sensitive entities in prompt with selective configuration.
 
@@ -44,6 +72,8 @@ def cloak_prompt(  # noqa: PLR0913
         entity_map: Existing placeholder mappings for consistency
         entity_config: Configuration for selective entity detection
         allowlist: Terms to exclude from cloaking (case-insensitive)
+        cache: Optional cache of detected entities, owned by the caller.
+            Prompts longer than MAX_CACHED_PROMPT_LENGTH are not cached.
 
     Returns:
         Tuple of (cloaked_prompt, entity_mapping)
@@ -53,6 +83,7 @@ def cloak_prompt(  # noqa: PLR0913
         - Sorts matches in descending order by start index
         - Replaces matches in one pass for optimal performance
         - Maintains placeholder consistency across calls
+        - Reuses cached results for repeated prompts when given a cache
 
     """
     if entity_map is None:
@@ -61,8 +92,7 @@ def cloak_prompt(  # noqa: PLR0913
     # Create a reverse map for quick lookups of existing values
     reversed_entity_map = {v: k for k, v in entity_map.items()}
 
-    detector = EntityDetector(entity_config)
-    entities: set[Entity] = detector.detect_entities(prompt)
+    entities = _detect_entities(prompt, entity_config, cache)
 
     # Filter out allowlisted terms (case-insensitive)
     if allowlist:
@@ -95,8 +125,7 @@ def cloak_prompt(  # noqa: PLR0913
             counter += 1
 
         # Find all occurrences of the entity value in the prompt
-        escaped = re.escape(entity.value)
-        for match in re.finditer(escaped, prompt):
+        for match in re.finditer(re.escape(entity.value), prompt):
             matches.append(
                 (match.start(), match.end(), placeholder, entity.value)
             )
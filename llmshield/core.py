@@ -65,6 +65,7 @@ from .utils import (
     PydanticLike,
     ask_helper,
     conversation_hash,
+    is_pydantic_like,
     is_valid_delimiter,
     is_valid_stream_response,
 )
@@ -116,6 +117,7 @@ class LLMShield:
         max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
         entity_config: EntityConfig | None = None,
         allowlist: list[str] | None = None,
+        prompt_cache_size: int = 0,
     ) -> None:
         """Initialise LLMShield with selective entity protection.
 
@@ -133,6 +135,12 @@ class LLMShield:
             allowlist: Terms to exclude from PII cloaking
                 (case-insensitive exact match). If None, nothing is
                 excluded.
+            prompt_cache_size: Number of prompts whose detected entities
+                are cached by this shield, so repeated prompts (e.g. a
+                shared system prompt) skip detection. The cache holds the
+                prompt text and the PII found in it until evicted or
+                `clear_cache()` is called. Prompts over 10,000 characters
+                are never cached. (default: 0, caching disabled)
 
         """
         # Validate delimiters
@@ -170,6 +178,19 @@ class LLMShield:
 
         self._last_entity_map = None
         self._cache: LRUCache[int, dict[str, str]] = LRUCache(max_cache_size)
+        self._prompt_cache: LRUCache | None = (
+            LRUCache(prompt_cache_size) if prompt_cache_size > 0 else None
+        )
+
+    def clear_cache(self) -> None:
+        """Drop everything this shield has cached.
+
+        Empties the prompt cache and the conversation entity map cache, so
+        no prompt text or detected PII is retained by the shield.
+        """
+        self._cache.clear()
+        if self._prompt_cache is not None:
+            self._prompt_cache.clear()
 
     @property
     def provider(self) -> BaseLLMProvider | None:
@@ -361,6 +382,7 @@ class LLMShield:
             entity_map=entity_map_param,
             entity_config=self.entity_config,
             allowlist=effective_allowlist or None,
+            cache=self._prompt_cache,
         )
         self._last_entity_map = entity_map
         return cloaked, entity_map
@@ -399,9 +421,9 @@ class LLMShield:
             raise ValidationError("Response cannot be empty")
 
         # Check if response is valid type or LLM response
-        valid_types = (str, list, dict, PydanticLike)
         if (
-            not isinstance(response, valid_types)  # type: ignore
+            not isinstance(response, (str, list, dict))
+            and not is_pydantic_like(response)
             and not is_chatcompletion_like(response)
             and not is_anthropic_message_like(response)
             and not is_xai_response_like(response)
@@ -432,7 +454,7 @@ class LLMShield:
         ):
             return _uncloak_response(response, entity_map)
 
-        if isinstance(response, PydanticLike):
+        if is_pydantic_like(response):
             model_class = response.__class__
             uncloaked_dict = _uncloak_response(
                 response.model_dump(), entity_map
@@ -445,6 +467,7 @@ class LLMShield:
         self,
         response_stream: Generator[str, None, None],
         entity_map: dict[str, str] | None = None,
+        min_chunk_size: int = 0,
     ) -> Generator[str, None, None]:
         """Restore original entities in streaming LLM responses.
 
@@ -462,6 +485,9 @@ class LLMShield:
             entity_map: Mapping of placeholders to original values.
                         By default, it is None, which means it will use the
                         last cloak call's entity map.
+            min_chunk_size: Coalesce output into chunks of at least this
+                        many characters, trading latency for fewer, larger
+                        chunks. By default (0), chunks are not coalesced.
 
         Yields:
             str: Uncloaked response chunks
@@ -495,10 +521,11 @@ class LLMShield:
             entity_map=entity_map,
             start_delimiter=self.start_delimiter,
             end_delimiter=self.end_delimiter,
+            min_chunk_size=min_chunk_size,
         )
 
     @classmethod
-    def disable_locations(
+    def disable_locations(  # noqa: PLR0913, PLR0917
         cls,
         start_delimiter: str = DEFAULT_START_DELIMITER,
         end_delimiter: str = DEFAULT_END_DELIMITER,
@@ -509,6 +536,7 @@ class LLMShield:
         ) = None,
         max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
         allowlist: list[str] | None = None,
+        prompt_cache_size: int = 0,
     ) -> "LLMShield":
         """Create LLMShield with location-based entities disabled.
 
@@ -521,10 +549,11 @@ class LLMShield:
             max_cache_size=max_cache_size,
             entity_config=EntityConfig.disable_locations(),
             allowlist=allowlist,
+            prompt_cache_size=prompt_cache_size,
         )
 
     @classmethod
-    def disable_persons(
+    def disable_persons(  # noqa: PLR0913, PLR0917
         cls,
         start_delimiter: str = DEFAULT_START_DELIMITER,
         end_delimiter: str = DEFAULT_END_DELIMITER,
@@ -535,6 +564,7 @@ class LLMShield:
         ) = None,
         max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
         allowlist: list[str] | None = None,
+        prompt_cache_size: int = 0,
     ) -> "LLMShield":
         """Create LLMShield with person entities disabled.
 
@@ -547,10 +577,11 @@ class LLMShield:
             max_cache_size=max_cache_size,
             entity_config=EntityConfig.disable_persons(),
             allowlist=allowlist,
+            prompt_cache_size=prompt_cache_size,
         )
 
     @classmethod
-    def disable_contacts(
+    def disable_contacts(  # noqa: PLR0913, PLR0917
         cls,
         start_delimiter: str = DEFAULT_START_DELIMITER,
         end_delimiter: str = DEFAULT_END_DELIMITER,
@@ -561,6 +592,7 @@ class LLMShield:
         ) = None,
         max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
         allowlist: list[str] | None = None,
+        prompt_cache_size: int = 0,
     ) -> "LLMShield":
         """Create LLMShield with contact information disabled.
 
@@ -573,10 +605,11 @@ class LLMShield:
             max_cache_size=max_cache_size,
             entity_config=EntityConfig.disable_contacts(),
             allowlist=allowlist,
+            prompt_cache_size=prompt_cache_size,
         )
 
     @classmethod
-    def only_financial(
+    def only_financial(  # noqa: PLR0913, PLR0917
         cls,
         start_delimiter: str = DEFAULT_START_DELIMITER,
         end_delimiter: str = DEFAULT_END_DELIMITER,
@@ -587,6 +620,7 @@ class LLMShield:
         ) = None,
         max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
         allowlist: list[str] | None = None,
+        prompt_cache_size: int = 0,
     ) -> "LLMShield":
         """Create LLMShield with only financial entities enabled.
 
@@ -599,10 +633,11 @@ class LLMShield:
             max_cache_size=max_cache_size,
             entity_config=EntityConfig.only_financial(),
             allowlist=allowlist,
+            prompt_cache_size=prompt_cache_size,
         )
 
     @classmethod
-    def enable_all(
+    def enable_all(  # noqa: PLR0913, PLR0917
         cls,
         start_delimiter: str = DEFAULT_START_DELIMITER,
         end_delimiter: str = DEFAULT_END_DELIMITER,
@@ -613,6 +648,7 @@ class LLMShield:
         ) = None,
         max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
         allowlist: list[str] | None = None,
+        prompt_cache_size: int = 0,
     ) -> "LLMShield":
         """Create LLMShield with all entity types enabled."""
         return cls(
@@ -622,6 +658,7 @@ class LLMShield:
             max_cache_size=max_cache_size,
             entity_config=EntityConfig.enable_all(),
             allowlist=allowlist,
+            prompt_cache_size=prompt_cache_size,
         )
 
     # Chaining methods
@@ -634,6 +671,9 @@ class LLMShield:
             max_cache_size=self._cache.capacity,
             entity_config=config,
             allowlist=(list(self._allowlist) if self._allowlist else None),
+            prompt_cache_size=(
+                self._prompt_cache.capacity if self._prompt_cache else 0
+            ),
         )
 
     def without_locations(self) -> "LLMShield":
@@ -697,6 +737,9 @@ class LLMShield:
             max_cache_size=size,
             entity_config=self.entity_config,
             allowlist=(list(self._allowlist) if self._allowlist else None),
+            prompt_cache_size=(
+                self._prompt_cache.capacity if self._prompt_cache else 0
+            ),
         )
 
     def ask(
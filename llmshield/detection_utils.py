@@ -24,6 +24,9 @@ Author:
 
 from typing import Any
 
+# Sentinel for attributes that are absent, as opposed to set to None
+_MISSING = object()
+
 
 def is_chatcompletion_like(obj: Any) -> bool:
     """Check if object appears to be a ChatCompletion response.
@@ -78,19 +81,16 @@ def extract_chatcompletion_content(obj: Any) -> str | None:
 
     try:
         choice = obj.choices[0]
-
-        # Try regular message content first
-        if hasattr(choice, "message") and hasattr(choice.message, "content"):
-            return choice.message.content
-
-        # Try streaming delta content
-        if hasattr(choice, "delta") and hasattr(choice.delta, "content"):
-            return choice.delta.content
-
-        return None
     except (IndexError, AttributeError):
         return None
 
+    # Try regular message content first, then streaming delta content;
+    # each attribute is fetched once rather than probed with hasattr
+    content = getattr(getattr(choice, "message", None), "content", _MISSING)
+    if content is _MISSING:
+        content = getattr(getattr(choice, "delta", None), "content", None)
+    return content
+
 
 def extract_anthropic_content(obj: Any) -> str | None:
     """Extract content from an Anthropic Message-like object.
@@ -25,6 +25,7 @@ Author:
 """
 
 # Standard Library Imports
+import re
 from dataclasses import dataclass
 from enum import StrEnum
 
@@ -37,19 +38,77 @@ from llmshield.matchers.lists import (
     EN_PLACE_COMPONENTS,
     EN_PUNCTUATION,
 )
-from llmshield.matchers.regex import (
-    CREDIT_CARD_PATTERN,
-    EMAIL_ADDRESS_PATTERN,
-    IP_ADDRESS_PATTERN,
-    PHONE_NUMBER_PATTERN,
-    URL_PATTERN,
-)
-from llmshield.utils import normalise_spaces, split_fragments
+from llmshield.matchers.regex import LOCATOR_PATTERN, NUMBER_PATTERN
 
 ENT_REPLACEMENT = "\n"  # Use to void overlap with another entity
 
 SPACE = " "
 
+# Single-character punctuation as a translate deletion table and as a class
+_PUNCT_CHARS = "".join(p for p in EN_PUNCTUATION if len(p) == 1)
+_PUNCT_TABLE = str.maketrans("", "", _PUNCT_CHARS)
+_PUNCT_CHAR_PATTERN = re.compile(f"[{re.escape(_PUNCT_CHARS)}]")
+
+# Punctuation (other than full stops) that rules a word out of a proper noun
+_FORBIDDEN_PUNCT_PATTERN = re.compile(
+    "|".join(re.escape(p) for p in EN_PUNCTUATION if p != ".")
+)
+
+# Word tokenisation with offsets into the original text
+_WORD_PATTERN = re.compile(r"\S+")
+_CONTRACTION_SPLIT = re.compile(r".*?(?:I'm|I've|I'll)|.+")
+_SENTENCE_END = ".!?"
+
+# A proper noun candidate: its (start, end) span and its text
+type ProperNoun = tuple[tuple[int, int], str]
+
+
+def _split_word_fragments(text: str) -> list[list[tuple[str, int]]]:
+    """Split text into fragments of words paired with their start offsets.
+
+    Equivalent to `split_fragments(normalise_spaces(text))` with each word
+    split after the contractions "I'm", "I've" and "I'll", but every word
+    keeps its position in the original text.
+    """
+    fragments = []
+    words: list[tuple[str, int]] = []
+    matches = list(_WORD_PATTERN.finditer(text))
+    last = len(matches) - 1
+    for i, match in enumerate(matches):
+        word, start = match.group(), match.start()
+        # Sentence punctuation ends a fragment unless it ends the text
+        stripped = word.rstrip(_SENTENCE_END) if i < last else word
+        # Only words containing a contraction need the splitting regex
+        if "I'" in stripped:
+            words.extend(
+                (piece.group(), start + piece.start())
+                for piece in _CONTRACTION_SPLIT.finditer(stripped)
+            )
+        elif stripped:
+            words.append((stripped, start))
+        if len(stripped) < len(word) and words:
+            fragments.append(words)
+            words = []
+    if words:
+        fragments.append(words)
+    return fragments
+
+
+def _mask_spans(text: str, spans: list[tuple[int, int]]) -> str:
+    """Replace each (start, end) span of the text with ENT_REPLACEMENT.
+
+    Spans must be sorted by start and must not overlap. The text is rebuilt
+    with a single join instead of one `str.replace` copy per entity.
+    """
+    parts = []
+    cursor = 0
+    for start, end in spans:
+        parts.append(text[cursor:start])
+        parts.append(ENT_REPLACEMENT)
+        cursor = end
+    parts.append(text[cursor:])
+    return "".join(parts)
+
 
 class EntityType(StrEnum):
     """Primary classification of entity types."""
@@ -118,23 +177,22 @@ class EntityGroup(StrEnum):
     NUMBER = "NUMBER"
     LOCATOR = "LOCATOR"
 
-    def get_types(self) -> set[EntityType]:
+    def get_types(self) -> frozenset[EntityType]:
         """Get all entity types belonging to this group."""
-        group_map = {
-            self.PNOUN: {
-                EntityType.PERSON,
-                EntityType.ORGANISATION,
-                EntityType.PLACE,
-                EntityType.CONCEPT,
-            },
-            self.NUMBER: {EntityType.PHONE, EntityType.CREDIT_CARD},
-            self.LOCATOR: {
-                EntityType.EMAIL,
-                EntityType.URL,
-                EntityType.IP_ADDRESS,
-            },
-        }
-        return group_map[self]
+        return _GROUP_TYPES[self]
+
+
+# Built once at import: the types of each group and the group of each type
+_GROUP_TYPES: dict[EntityGroup, frozenset[EntityType]] = {
+    EntityGroup.PNOUN: EntityType.proper_nouns(),
+    EntityGroup.NUMBER: EntityType.numbers(),
+    EntityGroup.LOCATOR: EntityType.locators(),
+}
+_TYPE_TO_GROUP: dict[EntityType, EntityGroup] = {
+    entity_type: group
+    for group, types in _GROUP_TYPES.items()
+    for entity_type in types
+}
 
 
 @dataclass(frozen=True)
@@ -147,9 +205,9 @@ class Entity:
     @property
     def group(self) -> EntityGroup:
         """Get the group this entity belongs to."""
-        for group in EntityGroup:
-            if self.type in group.get_types():
-                return group
+        group = _TYPE_TO_GROUP.get(self.type)
+        if group is not None:
+            return group
         msg = f"Unknown entity type: {self.type}"
         raise ValueError(msg)
 
@@ -288,23 +346,12 @@ class EntityDetector:
         self.config = config or EntityConfig()
         self.cache = get_entity_cache()
 
-        # Utility functions
-        self.split_fragments = split_fragments
-        self.normalise_spaces = normalise_spaces
-
         # Static data (lightweight references)
         self.en_person_initials = EN_PERSON_INITIALS
         self.en_org_components = EN_ORG_COMPONENTS
         self.en_place_components = EN_PLACE_COMPONENTS
         self.en_punctuation = EN_PUNCTUATION
 
-        # Compiled regex patterns (shared across instances)
-        self.email_pattern = EMAIL_ADDRESS_PATTERN
-        self.credit_card_pattern = CREDIT_CARD_PATTERN
-        self.ip_address_pattern = IP_ADDRESS_PATTERN
-        self.url_pattern = URL_PATTERN
-        self.phone_number_pattern = PHONE_NUMBER_PATTERN
-
         # Utility functions
         self.luhn_check = _luhn_check
 
@@ -344,94 +391,91 @@ class EntityDetector:
         If an entity is classified (and potentially cleaned), it is added as
         an Entity.
         """
+        # Candidates are built from disjoint runs of words, so their spans
+        # never overlap and are masked directly, in order.
         entities = set()
-        reduced_text = text
+        spans = []
+        classified: dict[str, tuple[str, EntityType] | None] = {}
 
-        # Step 1: Collect sequential proper nouns.
-        sequential_pnouns = self._collect_proper_nouns(text)
-
-        # Step 2: Process each proper noun.
-        for p_noun in sequential_pnouns:
-            if not p_noun or p_noun not in reduced_text:
+        for (start, end), p_noun in self._collect_proper_nouns(text):
+            # Candidates joined across line breaks or masked entities do not
+            # occur verbatim in the text and are not reported.
+            if not text.startswith(p_noun, start):
                 continue
 
-            result = self._classify_proper_noun(p_noun)
+            # Classify each distinct proper noun once.
+            if p_noun not in classified:
+                classified[p_noun] = self._classify_proper_noun(p_noun)
+            result = classified[p_noun]
             if result is None:
                 continue
 
             cleaned_value, entity_type = result
             entities.add(Entity(type=entity_type, value=cleaned_value))
-            reduced_text = reduced_text.replace(p_noun, ENT_REPLACEMENT)
+            spans.append((start, end))
 
-        return entities, reduced_text
+        return entities, _mask_spans(text, spans)
 
-    def _collect_proper_nouns(self, text: str) -> list[str]:
-        """Collect sequential proper nouns from text."""
+    def _collect_proper_nouns(self, text: str) -> list[ProperNoun]:
+        """Collect sequential proper nouns from text with their spans."""
         sequential_pnouns = []
-        normalised_text = self.normalise_spaces(text)
-        fragments = self.split_fragments(normalised_text)
-
-        for fragment in fragments:
-            fragment_nouns = self._process_fragment(fragment)
-            sequential_pnouns.extend(fragment_nouns)
-
-        return sorted(
-            [p for p in sequential_pnouns if p], key=len, reverse=True
-        )
+        for fragment in _split_word_fragments(text):
+            sequential_pnouns.extend(self._process_fragment(fragment))
+        return sequential_pnouns
 
-    def _process_fragment(self, fragment: str) -> list[str]:
+    def _process_fragment(
+        self, fragment: list[tuple[str, int]]
+    ) -> list[ProperNoun]:
         """Process a single text fragment to extract proper nouns."""
-        # Split on common contractions first
-        for split_word in ["I'm", "I've", "I'll"]:
-            if split_word in fragment:
-                fragment = fragment.replace(split_word, f"{split_word} ")
-
-        fragment_words = fragment.split(SPACE)
-        sequential_pnouns = []
-        pending_p_noun = ""
+        fragment_words = [word for word, _ in fragment]
+        sequential_pnouns: list[ProperNoun] = []
+        pending_p_noun: ProperNoun | None = None
         skip_next = False
 
-        for i, word in enumerate(fragment_words):
+        for i, (word, start) in enumerate(fragment):
             if skip_next:  # pragma: no cover
                 skip_next = False
                 continue
 
-            if not word:
-                continue
-
             # Handle personal pronouns and contractions
             if EntityDetector._should_skip_pronoun(
                 word, pending_p_noun, sequential_pnouns
             ):
-                pending_p_noun = ""
+                pending_p_noun = None
                 continue
 
             # Handle contraction lookahead
             if EntityDetector._handle_contraction_lookahead(  # pragma: no cover  # noqa: E501
                 word, i, fragment_words
             ):
-                pending_p_noun = fragment_words[i + 1]
+                next_word, next_start = fragment[i + 1]
+                pending_p_noun = (
+                    (next_start, next_start + len(next_word)),
+                    next_word,
+                )
                 skip_next = True
                 continue
 
             # Process potential proper noun
             pending_p_noun = self._process_word(
-                word, pending_p_noun, sequential_pnouns
+                word, start, pending_p_noun, sequential_pnouns
             )
 
         if pending_p_noun:
-            sequential_pnouns.append(pending_p_noun.strip())
+            sequential_pnouns.append(pending_p_noun)
 
         return sequential_pnouns
 
     @staticmethod
     def _should_skip_pronoun(
-        word: str, pending_p_noun: str, sequential_pnouns: list[str]
+        word: str,
+        pending_p_noun: ProperNoun | None,
+        sequential_pnouns: list[ProperNoun],
     ) -> bool:
         """Check if word is a pronoun that should be skipped."""
         if word in {"I'm", "I've", "I'll", "I"}:
             if pending_p_noun:
-                sequential_pnouns.append(pending_p_noun.strip())
+                sequential_pnouns.append(pending_p_noun)
             return True
         return False
 
@@ -447,22 +491,29 @@ class EntityDetector:
         return False
 
     def _process_word(
-        self, word: str, pending_p_noun: str, sequential_pnouns: list[str]
-    ) -> str:
+        self,
+        word: str,
+        start: int,
+        pending_p_noun: ProperNoun | None,
+        sequential_pnouns: list[ProperNoun],
+    ) -> ProperNoun | None:
         """Process a word for proper noun detection."""
-        normalized_word = word.strip(".,!?;:")
-        is_honorific = normalized_word in self.en_person_initials
-        is_capitalised = word and word[0].isupper()
-
-        if is_honorific or (
-            not any(c in word for c in self.en_punctuation if c != ".")
-            and is_capitalised
-        ):
-            return pending_p_noun + SPACE + word if pending_p_noun else word
+        # The first character decides most words: lowercase words skip the
+        # punctuation scan and only need the honorific lookup.
+        is_capitalised = word[:1].isupper()
+        is_p_noun = (
+            is_capitalised and not _FORBIDDEN_PUNCT_PATTERN.search(word)
+        ) or word.strip(".,!?;:") in self.en_person_initials
+
+        if is_p_noun:
+            end = start + len(word)
+            if pending_p_noun:
+                (pending_start, _), pending_text = pending_p_noun
+                return (pending_start, end), pending_text + SPACE + word
+            return (start, end), word
         if pending_p_noun:
-            sequential_pnouns.append(pending_p_noun.strip())
-            return ""
-        return pending_p_noun
+            sequential_pnouns.append(pending_p_noun)
+        return None
 
     def _clean_person_name(self, p_noun: str) -> str:
         """Remove a leading honorific (if any) from a person proper noun.
@@ -493,21 +544,22 @@ class EntityDetector:
 
         def clean_value(value: str) -> str:
             """Remove all punctuation from the value."""
-            return "".join(
-                c for c in value if c not in self.en_punctuation
-            ).strip()
+            return value.translate(_PUNCT_TABLE).strip()
+
+        # Lowercase once for all the dictionary lookups below.
+        p_noun_lower = p_noun.lower()
 
         # 1. Check for organisations first.
-        if self._is_organisation(p_noun):
+        if self._is_organisation(p_noun, p_noun_lower):
             return (clean_value(p_noun), EntityType.ORGANISATION)
 
         # 2. Check for places.
-        if self._is_place(p_noun):
+        if self._is_place(p_noun, p_noun_lower):
             return (clean_value(p_noun), EntityType.PLACE)
 
         # 3. Check for concepts (all uppercase, single word).
         # Should be checked before persons.
-        if self._is_concept(p_noun):
+        if self._is_concept(p_noun, p_noun_lower):
             return (clean_value(p_noun), EntityType.CONCEPT)
 
         # 4. Check for persons.
@@ -519,29 +571,37 @@ class EntityDetector:
         # 5. Default to None.
         return None
 
-    def _is_concept(self, p_noun: str) -> bool:
+    def _is_concept(
+        self, p_noun: str, p_noun_lower: str | None = None
+    ) -> bool:
         """Check if proper noun is a concept."""
+        if p_noun_lower is None:
+            p_noun_lower = p_noun.lower()
         return (
             all(word.isupper() for word in p_noun.split())
             and len(p_noun.split()) == 1
-            and not any(c in p_noun for c in self.en_punctuation)
-            and not self.cache.is_english_word(p_noun.lower())
+            and not _PUNCT_CHAR_PATTERN.search(p_noun)
+            and not self.cache.is_english_word(p_noun_lower)
         )
 
-    def _is_organisation(self, p_noun: str) -> bool:
+    def _is_organisation(
+        self, p_noun: str, p_noun_lower: str | None = None
+    ) -> bool:
         """Check if proper noun is an organisation.
 
         Uses the organisations.txt dictionary.
         """
-        p_noun_lower = p_noun.lower()
+        if p_noun_lower is None:
+            p_noun_lower = p_noun.lower()
         return self.cache.is_organisation(p_noun_lower)
 
-    def _is_place(self, p_noun: str) -> bool:
+    def _is_place(self, p_noun: str, p_noun_lower: str | None = None) -> bool:
         """Check if proper noun is a place."""
-        p_noun_lower = p_noun.lower()
-        return self.cache.is_place(p_noun_lower) or any(
-            comp in p_noun.split() for comp in self.en_place_components
-        )
+        if p_noun_lower is None:
+            p_noun_lower = p_noun.lower()
+        if self.cache.is_place(p_noun_lower):
+            return True
+        return not self.en_place_components.isdisjoint(p_noun.split())
 
     def _is_person(self, p_noun: str) -> bool:
         """Check if proper noun is a person."""
@@ -584,7 +644,7 @@ class EntityDetector:
             if (
                 not clean_word[0].isupper()
                 or self.cache.is_english_word(clean_word.lower())
-                or any(c.isdigit() for c in clean_word)
+                or any(map(str.isdigit, clean_word))
             ):
                 return False
 
@@ -592,89 +652,34 @@ class EntityDetector:
 
     def _detect_numbers(self, text: str) -> tuple[set[Entity], str]:
         """Detect numbers in the text."""
-        entities = set()
-        reduced_text = text
-
-        # * 1. Split on sentence boundaries (punctuation / new line)
-        emails = self.email_pattern.finditer(text)
-        for email in emails:
-            entities.add(
-                Entity(
-                    type=EntityType.EMAIL,
-                    value=email.group(),
-                ),
-            )
-            reduced_text = reduced_text.replace(email.group(), ENT_REPLACEMENT)
-
-        # * 2. Detect credit cards
-        credit_cards = self.credit_card_pattern.finditer(text)
-        for credit_card in credit_cards:
-            if self.luhn_check(credit_card.group()):
-                entities.add(
-                    Entity(
-                        type=EntityType.CREDIT_CARD,
-                        value=credit_card.group(),
-                    ),
-                )
-                reduced_text = reduced_text.replace(
-                    credit_card.group(), ENT_REPLACEMENT
-                )
-
-        # * 3. Detect phone numbers
-        phone_numbers = self.phone_number_pattern.finditer(text)
-        for phone_number in phone_numbers:
-            entities.add(
-                Entity(
-                    type=EntityType.PHONE,
-                    value=phone_number.group(),
-                ),
-            )
-            reduced_text = reduced_text.replace(
-                phone_number.group(), ENT_REPLACEMENT
-            )
-
-        # * 4. Return the reduced text and entities found
-        return entities, reduced_text
+        return self._detect_pattern_matches(NUMBER_PATTERN, text)
 
     def _detect_locators(self, text: str) -> tuple[set[Entity], str]:
         """Detect locators in the text."""
+        return self._detect_pattern_matches(LOCATOR_PATTERN, text)
+
+    def _detect_pattern_matches(
+        self, pattern: re.Pattern[str], text: str
+    ) -> tuple[set[Entity], str]:
+        """Detect entities matched by a combined named-group pattern.
+
+        The text is scanned once and each match is dispatched on the name
+        of the group that matched, which is the name of its entity type.
+        """
         entities = set()
-        reduced_text = text
-
-        # * 1. Detect URLs
-        urls = self.url_pattern.finditer(text)
-        for url in urls:
-            entities.add(
-                Entity(
-                    type=EntityType.URL,
-                    value=url.group(),
-                ),
-            )
-            reduced_text = reduced_text.replace(url.group(), ENT_REPLACEMENT)
-
-        # * 2. Detect emails
-        emails = self.email_pattern.finditer(text)
-        for email in emails:
-            entities.add(
-                Entity(
-                    type=EntityType.EMAIL,
-                    value=email.group(),
-                ),
-            )
-            reduced_text = reduced_text.replace(email.group(), ENT_REPLACEMENT)
-
-        # * 3. Detect IP addresses
-        ip_addresses = self.ip_address_pattern.finditer(text)
-        for ip_address in ip_addresses:
-            entities.add(
-                Entity(
-                    type=EntityType.IP_ADDRESS,
-                    value=ip_address.group(),
-                ),
-            )
-            reduced_text = reduced_text.replace(
-                ip_address.group(), ENT_REPLACEMENT
-            )
+        spans = []
+
+        for match in pattern.finditer(text):
+            entity_type = EntityType[match.lastgroup]
+            value = match.group()
+
+            # Card-like numbers must also pass the Luhn checksum
+            if entity_type == EntityType.CREDIT_CARD and not self.luhn_check(
+                value
+            ):
+                continue
+
+            entities.add(Entity(type=entity_type, value=value))
+            spans.append(match.span())
 
-        # * 4. Return the reduced text and entities found
-        return entities, reduced_text
+        return entities, _mask_spans(text, spans)
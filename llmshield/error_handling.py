@@ -222,9 +222,9 @@ def safe_resource_load(
             .open("r", encoding="utf-8")
         ) as f:
             return [
-                line.strip()
+                stripped
                 for line in f
-                if line.strip() and not line.startswith("#")
+                if (stripped := line.strip()) and not line.startswith("#")
             ]
     except FileNotFoundError:
         raise ResourceLoadError(
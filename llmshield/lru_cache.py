@@ -61,3 +61,7 @@ class LRUCache[K, V]:
         self.cache.move_to_end(key)
         if len(self.cache) > self.capacity:
             self.cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every item from the cache."""
+        self.cache.clear()
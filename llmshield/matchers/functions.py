@@ -12,12 +12,24 @@ Author:
     LLMShield by brainpolo, 2025-2026
 """
 
+# * LUHN
+# ----------------------------------------------------------------------------
+# 256-byte translation tables mapping each ASCII digit to its Luhn value, so
+# the checksum is computed with `bytes.translate` and `sum` entirely in C.
+# Doubled digits map to the digit sum of twice their value.
+_DIGITS = b"0123456789"
+_NON_DIGITS = bytes(b for b in range(256) if b not in _DIGITS)
+_LUHN_PLAIN = bytes.maketrans(_DIGITS, bytes([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]))
+_LUHN_DOUBLED = bytes.maketrans(_DIGITS, bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9]))
+
 
 def _luhn_check(card_number: str) -> bool:
     """Validate card number using Luhn algorithm."""
-    digits = [int(d) for d in card_number if d.isdigit()]
-    checksum = digits.pop()
-    digits.reverse()
-    doubled = [(d * 2) if i % 2 == 0 else d for i, d in enumerate(digits)]
-    total = sum(sum(divmod(d, 10)) for d in doubled) + checksum
+    digits = card_number.encode("ascii", "ignore").translate(None, _NON_DIGITS)
+    if not digits:
+        return False
+    # From the rightmost (check) digit, every second digit is doubled
+    total = sum(digits[-1::-2].translate(_LUHN_PLAIN)) + sum(
+        digits[-2::-2].translate(_LUHN_DOUBLED)
+    )
     return total % 10 == 0
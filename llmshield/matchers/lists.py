@@ -4,7 +4,8 @@ Description:
     This module contains lists of keywords and components used for entity
     detection. These lists include person titles, organisation identifiers,
     place components, and punctuation markers that help identify and classify
-    different types of entities in text.
+    different types of entities in text. Word lists used for membership
+    tests are frozensets; punctuation is an ordered tuple.
 
 Lists:
     EN_PUNCTUATION: Common English punctuation marks
@@ -18,56 +19,62 @@ Author:
 
 # * Punctuation
 # ----------------------------------------------------------------------------
-EN_PUNCTUATION = ["!", ",", ".", "?", "\\'", "\\'"]
+EN_PUNCTUATION = ("!", ",", ".", "?", "\\'")
 
 
 # * PERSON
 # ----------------------------------------------------------------------------
-EN_PERSON_INITIALS = [
-    "Mr.",
-    "Mrs.",
-    "Ms.",
-    "Dr.",
-    "Prof.",
-    "Professor",
-    "Sir",
-    "Lady",
-    "Lord",
-    "Duke",
-    "Duchess",
-    "Prince",
-    "Princess",
-    "King",
-    "Queen",
-    "CEO",
-    "VP",
-    "CFO",
-    "COO",
-    "CTO",
-]
+EN_PERSON_INITIALS = frozenset(
+    {
+        "Mr.",
+        "Mrs.",
+        "Ms.",
+        "Dr.",
+        "Prof.",
+        "Professor",
+        "Sir",
+        "Lady",
+        "Lord",
+        "Duke",
+        "Duchess",
+        "Prince",
+        "Princess",
+        "King",
+        "Queen",
+        "CEO",
+        "VP",
+        "CFO",
+        "COO",
+        "CTO",
+    }
+)
 
 
 # * ORGANISATION
 # ----------------------------------------------------------------------------
-EN_ORG_COMPONENTS = [
-    "Holdings",
-    "Group",
-    "LLP",
-    "Ltd",
-    "Corp",
-    "Corporation",
-    "Inc",
-    "Industries",
-    "Company",
-    "Co",
-    "LLC",
-    "GmbH",
-    "AG",
-    "Pty",
-    "L.P.",
-]
+EN_ORG_COMPONENTS = frozenset(
+    {
+        "Holdings",
+        "Group",
+        "LLP",
+        "Ltd",
+        "Corp",
+        "Corporation",
+        "Inc",
+        "Industries",
+        "Company",
+        "Co",
+        "LLC",
+        "GmbH",
+        "AG",
+        "Pty",
+        "L.P.",
+    }
+)
 
 # * PLACES
 # ----------------------------------------------------------------------------
 
-EN_PLACE_COMPONENTS = ["St", "St.", "Street", "Road", "Avenue", "Ave", "Rd"]
+EN_PLACE_COMPONENTS = frozenset(
+    {"St", "St.", "Street", "Road", "Avenue", "Ave", "Rd"}
+)
@@ -12,6 +12,8 @@ Patterns:
     IP_ADDRESS_PATTERN: Matches IPv4 addresses
     URL_PATTERN: Matches HTTP/HTTPS URLs
     PHONE_NUMBER_PATTERN: Matches phone numbers (US and international)
+    LOCATOR_PATTERN: Single-pass alternation of URL, email and IP patterns
+    NUMBER_PATTERN: Single-pass alternation of credit card and phone patterns
 
 Author:
     LLMShield by brainpolo, 2025-2026
@@ -99,3 +101,35 @@ PHONE_NUMBER_PATTERN = re.compile(
     r")"
     r"(?!\d)",  # Negative lookahead: ensure no digit immediately follows.
 )
+
+
+# * COMBINED
+# --------------------------------------------------------------------------
+# Each detection stage scans the text once with a single alternation instead
+# of running one `finditer` per pattern. Group names match `EntityType`
+# names so a match can be dispatched on `match.lastgroup`. Alternatives are
+# tried in order at each position, so earlier patterns take precedence.
+#
+# Locators and numbers stay separate stages: numbers are matched on the text
+# left after locators are masked. In a single alternation, a phone match that
+# starts earlier would win and could run on into a following IP address.
+def _named_alternation(**patterns: re.Pattern[str]) -> re.Pattern[str]:
+    """Combine compiled patterns into one alternation of named groups."""
+    return re.compile(
+        "|".join(
+            f"(?P<{name}>{pattern.pattern})"
+            for name, pattern in patterns.items()
+        )
+    )
+
+
+LOCATOR_PATTERN = _named_alternation(
+    URL=URL_PATTERN,
+    EMAIL=EMAIL_ADDRESS_PATTERN,
+    IP_ADDRESS=IP_ADDRESS_PATTERN,
+)
+
+NUMBER_PATTERN = _named_alternation(
+    CREDIT_CARD=CREDIT_CARD_PATTERN,
+    PHONE=PHONE_NUMBER_PATTERN,
+)
@@ -22,6 +22,10 @@ Author:
 import contextlib
 import copy
 import json
+import os
+import re
+from collections.abc import Callable, Iterator
+from functools import lru_cache
 from typing import Any
 
 # Local Imports
@@ -32,7 +36,7 @@ from llmshield.detection_utils import (
     is_google_response_like,
     is_xai_response_like,
 )
-from llmshield.utils import PydanticLike
+from llmshield.utils import PydanticLike, is_pydantic_like
 
 
 def _uncloak_response(
@@ -63,7 +67,7 @@ def _uncloak_response(
         Uncloaked response with original values restored
 
     """
-    if not entity_map:
+    if not entity_map or type(response) in _PASSTHROUGH_TYPES:
         return response
 
     # Handle basic types
@@ -75,35 +79,146 @@ def _uncloak_response(
     return _uncloak_complex_types(response, entity_map)
 
 
-def _uncloak_basic_types(response: Any, entity_map: dict[str, str]) -> Any:
-    """Handle uncloaking for basic types (str, list, dict)."""
-    if isinstance(response, str):
-        result = response
-        for placeholder, original in entity_map.items():
-            result = result.replace(placeholder, original)
-        # Handle JSON with unicode-escaped delimiters
-        # (e.g. Cohere returns \u003c instead of <)
-        if result == response:
-            try:
-                parsed = json.loads(response)
-            except ValueError:
-                parsed = None
-            if isinstance(parsed, (dict, list)):
-                uncloaked = _uncloak_response(parsed, entity_map)
-                if uncloaked != parsed:
-                    return json.dumps(uncloaked)
-        return result
+@lru_cache(maxsize=128)
+def _placeholder_pattern(placeholders: frozenset[str]) -> re.Pattern[str]:
+    """Compile (once) an alternation matching any of the placeholders.
 
-    if isinstance(response, list):
-        return [_uncloak_response(item, entity_map) for item in response]
+    Longer placeholders come first so that a placeholder which is a prefix
+    of another never shadows it.
+    """
+    return re.compile(
+        "|".join(map(re.escape, sorted(placeholders, key=len, reverse=True)))
+    )
+
+
+class _Substitutor:
+    """Placeholder substitution prepared once for a whole response.
+
+    Holds the compiled pattern for an entity map so that every string in a
+    structured response is uncloaked without rebuilding or looking it up.
+    """
 
-    if isinstance(response, dict):
-        return {
-            key: _uncloak_response(value, entity_map)
-            for key, value in response.items()
-        }
+    __slots__ = ("entity_map", "pattern", "prefix")
 
-    return None
+    def __init__(self, entity_map: dict[str, str]) -> None:
+        """Compile (or fetch) the pattern for the entity map."""
+        self.entity_map = entity_map
+        self.pattern = _placeholder_pattern(frozenset(entity_map))
+        # Shared by every placeholder (at least the start delimiter)
+        self.prefix = os.path.commonprefix(list(entity_map))
+
+    def _restore(self, match: re.Match[str]) -> str:
+        """Return the original value for a matched placeholder."""
+        return self.entity_map[match.group()]
+
+    def sub(self, text: str) -> str:
+        """Replace every placeholder in the text in a single scan.
+
+        Restored values are never rescanned for placeholders. Text without
+        the common placeholder prefix is returned without running the
+        pattern at all.
+        """
+        if self.prefix not in text:
+            return text
+        return self.pattern.sub(self._restore, text)
+
+
+def _uncloak_basic_types(response: Any, entity_map: dict[str, str]) -> Any:
+    """Handle uncloaking for basic types (str, list, dict)."""
+    handler = _BASIC_HANDLERS.get(type(response))
+    if handler is None:
+        # Subclasses of the basic types, e.g. OrderedDict
+        if isinstance(response, str):
+            handler = _uncloak_string
+        elif isinstance(response, (list, dict)):
+            handler = _uncloak_container
+        else:
+            return None
+
+    return handler(response, _Substitutor(entity_map))
+
+
+def _uncloak_string(text: str, substitutor: _Substitutor) -> str:
+    """Uncloak a string, including JSON with escaped delimiters."""
+    result = substitutor.sub(text)
+    # Handle JSON with unicode-escaped delimiters
+    # (e.g. Cohere returns \u003c instead of <)
+    if result == text:
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, (dict, list)):
+            uncloaked = _uncloak_container(parsed, substitutor)
+            if uncloaked is not parsed:
+                return json.dumps(uncloaked)
+    return result
+
+
+def _uncloak_container(
+    container: list[Any] | dict[str, Any], substitutor: _Substitutor
+) -> list[Any] | dict[str, Any]:
+    """Uncloak the values of a list or dict, copying only what changes.
+
+    Nested lists and dicts are walked with an explicit stack instead of
+    recursion, so deeply nested structured outputs cannot exceed the
+    recursion limit. A container is copied on its first changed value, so
+    unchanged subtrees are shared with the input instead of rebuilt, and a
+    response without placeholders is returned as is. Strings share the
+    caller's substitutor; every other value is uncloaked by
+    `_uncloak_response`.
+    """
+    # Frames are [source, items iterator, copy (or None), key in parent]
+    stack = [[container, _iter_items(container), None, None]]
+    while True:
+        frame = stack[-1]
+        for key, value in frame[1]:
+            if type(value) in _PASSTHROUGH_TYPES:
+                continue
+            if isinstance(value, (list, dict)):
+                stack.append([value, _iter_items(value), None, key])
+                break
+            if isinstance(value, str):
+                new_value = _uncloak_string(value, substitutor)
+            else:
+                new_value = _uncloak_response(value, substitutor.entity_map)
+            if new_value is not value:
+                _write(frame, key, new_value)
+        else:
+            # Every value of this container has been visited
+            stack.pop()
+            source, _, copied, key = frame
+            result = source if copied is None else copied
+            if not stack:
+                return result
+            if result is not source:
+                _write(stack[-1], key, result)
+
+
+def _iter_items(container: list[Any] | dict[str, Any]) -> Iterator[Any]:
+    """Return an iterator over the (key, value) pairs of a list or dict."""
+    if isinstance(container, dict):
+        return iter(container.items())
+    return enumerate(container)
+
+
+def _write(frame: list[Any], key: Any, value: Any) -> None:
+    """Store a changed value, copying the frame's container on first write."""
+    if frame[2] is None:
+        frame[2] = frame[0].copy()
+    frame[2][key] = value
+
+
+# Exact-type dispatch for the built-in response types, avoiding a chain of
+# isinstance checks on the common path
+_BASIC_HANDLERS: dict[type, Callable[[Any, _Substitutor], Any]] = {
+    str: _uncloak_string,
+    list: _uncloak_container,
+    dict: _uncloak_container,
+}
+
+# Leaf types that can never hold a placeholder
+_PASSTHROUGH_TYPES = frozenset({int, float, bool, type(None)})
 
 
 def _uncloak_complex_types(  # noqa: PLR0911
@@ -132,7 +247,7 @@ def _uncloak_complex_types(  # noqa: PLR0911
     if is_google_response_like(response):
         return _uncloak_google_response(response, entity_map)
 
-    if isinstance(response, PydanticLike):
+    if is_pydantic_like(response):
         return _uncloak_response(response.model_dump(), entity_map)
 
     # Return the response if not a recognized type
@@ -3,7 +3,8 @@
 Description:
     This module handles the restoration of original sensitive data in
     streaming LLM responses. It uses an intelligent buffering approach to
-    handle placeholders that may be split across multiple stream chunks.
+    handle placeholders that may be split across multiple stream chunks,
+    holding back no more than the longest placeholder at a time.
 
 Functions:
     stream_uncloak_response: Restore entities in streaming LLM responses
@@ -26,6 +27,7 @@ def uncloak_stream_response(
     entity_map: dict[str, str] | None = None,
     start_delimiter: str = "<",
     end_delimiter: str = ">",
+    min_chunk_size: int = 0,
 ) -> Generator[str, None, None]:
     """Uncloaks a stream response by replacing placeholders with values.
 
@@ -34,11 +36,50 @@ def uncloak_stream_response(
         entity_map: A mapping of placeholders to original values.
         start_delimiter: The start delimiter for placeholders.
         end_delimiter: The end delimiter for placeholders.
+        min_chunk_size: Coalesce uncloaked output into chunks of at least
+            this many characters (the last chunk may be shorter). By
+            default, every uncloaked piece is yielded as soon as it is
+            ready.
 
     Yields:
         str: The uncloaked response chunks.
 
     """
+    chunks = _uncloak_chunks(
+        stream, entity_map, start_delimiter, end_delimiter
+    )
+    if min_chunk_size > 0:
+        chunks = _coalesce(chunks, min_chunk_size)
+    yield from chunks
+
+
+def _coalesce(
+    chunks: Generator[str, None, None], min_chunk_size: int
+) -> Generator[str, None, None]:
+    """Join consecutive chunks until they reach the minimum size."""
+    pending: list[str] = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= min_chunk_size:
+            yield "".join(pending)
+            pending.clear()
+            size = 0
+    if pending:
+        yield "".join(pending)
+
+
+def _uncloak_chunks(
+    stream: Generator[str, None, None],
+    entity_map: dict[str, str] | None,
+    start_delimiter: str,
+    end_delimiter: str,
+) -> Generator[str, None, None]:
+    """Yield uncloaked pieces of the stream as soon as they are known."""
+    # A start delimiter with no end delimiter within the longest placeholder
+    # is literal text, so at most one placeholder's worth is ever held back
+    max_placeholder_len = max(map(len, entity_map or {}), default=0)
     buffer = ""
     for chunk in stream:
         # Extract actual text content if possible (for OpenAI
@@ -69,14 +110,24 @@ def uncloak_stream_response(
                 yield buffer[:start_pos]
                 buffer = buffer[start_pos:]
             # Look for placeholder end
-            end_pos = buffer.find(end_delimiter)
-            if end_pos == -1:
+            end_pos = buffer.find(end_delimiter, 0, max_placeholder_len)
+            if end_pos == -1 and len(buffer) < max_placeholder_len:
                 # Incomplete placeholder, wait for more chunks
                 break
-            # Extract and uncloak complete placeholder
-            placeholder = buffer[: end_pos + len(end_delimiter)]
-            yield entity_map.get(placeholder, placeholder)  # type: ignore
-            buffer = buffer[end_pos + len(end_delimiter) :]
+            if end_pos != -1:
+                # Extract and uncloak complete placeholder
+                placeholder = buffer[: end_pos + len(end_delimiter)]
+                if placeholder in entity_map:  # type: ignore
+                    yield entity_map[placeholder]  # type: ignore
+                    buffer = buffer[len(placeholder) :]
+                    continue
+            # Not a placeholder: the start delimiter is literal text, so
+            # yield up to the next start delimiter
+            next_start = buffer.find(start_delimiter, 1)
+            if next_start == -1:
+                next_start = len(buffer)
+            yield buffer[:next_start]
+            buffer = buffer[next_start:]
     # Yield any remaining buffer content
     if buffer:
         yield buffer
@@ -10,6 +10,7 @@ Protocols:
     PydanticLike: Protocol for Pydantic-compatible objects
 
 Functions:
+    is_pydantic_like: Check if an object satisfies PydanticLike
     split_fragments: Split text into processable fragments
     is_valid_delimiter: Validate delimiter strings
     wrap_entity: Create placeholder strings for entities
@@ -26,6 +27,7 @@ Author:
 import collections.abc
 import re
 from collections.abc import Generator
+from functools import lru_cache
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -41,6 +43,9 @@ from typing import (
 if TYPE_CHECKING:
     from llmshield.entity_detector import EntityType
 
+# Sentence boundaries (punctuation or new lines)
+_FRAG_RE = re.compile(r"[.!?]+\s+|\n+")
+
 
 @runtime_checkable
 class PydanticLike(Protocol):  # pylint: disable=unnecessary-ellipsis
@@ -68,6 +73,19 @@ class PydanticLike(Protocol):  # pylint: disable=unnecessary-ellipsis
         ...  # pylint: disable=unnecessary-ellipsis
 
 
+def is_pydantic_like(obj: object) -> bool:
+    """Check whether an object satisfies the `PydanticLike` protocol.
+
+    Args:
+        obj: The object to check.
+
+    Returns:
+        True if the object provides `model_dump` and `model_validate`.
+
+    """
+    return isinstance(obj, PydanticLike)
+
+
 def split_fragments(text: str) -> list[str]:
     """Split the text into fragments based on the following rules.
 
@@ -81,8 +99,7 @@ def split_fragments(text: str) -> list[str]:
         A list of fragments.
 
     """
-    fragments = re.split(r"[.!?]+\s+|\n+", text)
-    return [f.strip() for f in fragments if f.strip()]
+    return [f for f in (s.strip() for s in _FRAG_RE.split(text)) if f]
 
 
 def is_valid_delimiter(delimiter: str) -> bool:
@@ -101,6 +118,7 @@ def is_valid_delimiter(delimiter: str) -> bool:
     return isinstance(delimiter, str) and len(delimiter) > 0
 
 
+@lru_cache(maxsize=4096)
 def wrap_entity(
     entity_type: "EntityType",
     suffix: int,
@@ -113,6 +131,9 @@ def wrap_entity(
     - The value will be wrapped with START_DELIMETER and END_DELIMETER.
     - The suffix will be appended to the entity.
 
+    Placeholders are cached, since every cloak call re-creates the same
+    low-numbered ones for the same delimiters.
+
     Args:
         entity_type: The entity to wrap.
         suffix: The suffix to append to the entity.
@@ -128,7 +149,9 @@ def wrap_entity(
 
 def normalise_spaces(text: str) -> str:
     """Normalise spaces by replacing multiple spaces with single space."""
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split() with no separator drops every whitespace run, including
+    # leading and trailing ones, exactly as `\s+` would match them
+    return " ".join(text.split())
 
 
 def is_valid_stream_response(obj: object) -> bool:
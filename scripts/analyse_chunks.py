@@ -1,51 +1,127 @@
 #!/usr/bin/env python3
 """Analyse text files for entity detection in chunks."""
 
+import mmap
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from llmshield import LLMShield  # skipcq: FLK-E402
 
+# Number of chunks between progress updates
+PROGRESS_EVERY = 16
+
+# UTF-8 continuation bytes look like 0b10xxxxxx
+UTF8_CONTINUATION_MASK = 0xC0
+UTF8_CONTINUATION_BITS = 0x80
+
+
+def _scan_chunk(file_path: str, bounds: tuple[int, int]) -> dict[str, str]:
+    """Return the entity map of one byte range (runs in a worker process).
+
+    Each worker reads only its own range, so no process holds more than a
+    chunk of the file at once.
+    """
+    start, end = bounds
+    with open(file_path, "rb") as f:  # skipcq: PTC-W6004
+        f.seek(start)
+        chunk = f.read(end - start).decode("utf-8")
+    _, entity_map = LLMShield().cloak(chunk)
+    return entity_map
+
+
+def _chunk_bounds(
+    file_path: str, chunk_size: int, overlap: int
+) -> list[tuple[int, int]]:
+    """Return overlapping byte ranges covering the file.
+
+    Consecutive ranges share `overlap` bytes, so an entity cut at one
+    chunk's edge is seen whole in the next. Every boundary is moved back to
+    the start of a UTF-8 character so each range decodes on its own.
+    """
+    size = Path(file_path).stat().st_size
+    if not size:
+        return []
+
+    with (
+        open(file_path, "rb") as f,  # skipcq: PTC-W6004
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+
+        def align(pos: int) -> int:
+            while (
+                0 < pos < size
+                and mm[pos] & UTF8_CONTINUATION_MASK == UTF8_CONTINUATION_BITS
+            ):
+                pos -= 1
+            return pos
+
+        step = chunk_size - overlap
+        return [
+            (align(i), align(min(i + chunk_size, size)))
+            for i in range(0, max(size - overlap, 1), step)
+        ]
+
+
+def analyse_in_chunks(
+    file_path: str, chunk_size: int = 50000, overlap: int = 512
+):
+    """Analyse text file in overlapping chunks."""
+    if not 0 <= overlap < chunk_size:
+        raise ValueError("overlap must be in [0, chunk_size)")
 
-def analyse_in_chunks(file_path: str, chunk_size: int = 50000):
-    """Analyse text file in chunks."""
     print(f"Reading: {file_path}")
-    with open(file_path, encoding="utf-8") as f:  # skipcq: PTC-W6004
-        text = f.read()
-
-    print(f"File size: {len(text):,} characters")
-    print(f"Processing in chunks of {chunk_size:,} characters")
+    bounds = _chunk_bounds(file_path, chunk_size, overlap)
+    num_chunks = len(bounds)
+
+    print(f"File size: {Path(file_path).stat().st_size:,} bytes")
+    print(
+        f"Processing in chunks of {chunk_size:,} bytes "
+        f"({overlap:,} overlapping)"
+    )
     print()
 
-    shield = LLMShield()
-    all_entities = {}
-
-    # Process in chunks
-    num_chunks = (len(text) + chunk_size - 1) // chunk_size
-
-    for i in range(0, len(text), chunk_size):
-        chunk_num = i // chunk_size + 1
-        chunk = text[i : i + chunk_size]
+    all_entities: dict[str, str] = {}
 
-        print(f"Processing chunk {chunk_num}/{num_chunks}...", end="\r")
+    # Progress only goes to an interactive terminal, and only every few
+    # chunks, so redirected runs are not flooded with carriage returns
+    show_progress = sys.stderr.isatty()
 
-        _, entity_map = shield.cloak(chunk)
-
-        # Merge entities
-        for placeholder, value in entity_map.items():
-            if value not in all_entities:
-                entity_type = placeholder.split("_")[0].replace("<", "")
-                all_entities[value] = entity_type
-
-    print(f"\nFound {len(all_entities)} unique entities across all chunks")
+    # Process chunks in parallel; results come back in chunk order, so the
+    # merge below sees entities in the same order as a serial scan.
+    # Overlapping chunks can report the same entity; it merges by value
+    with ProcessPoolExecutor() as executor:
+        entity_maps = executor.map(
+            partial(_scan_chunk, file_path), bounds, chunksize=4
+        )
+        for chunk_num, entity_map in enumerate(entity_maps, start=1):
+            if show_progress and (
+                chunk_num % PROGRESS_EVERY == 0 or chunk_num == num_chunks
+            ):
+                print(
+                    f"Processed chunk {chunk_num}/{num_chunks}...",
+                    end="\r",
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+            # Merge entities, keeping the type of the first sighting
+            for placeholder, value in entity_map.items():
+                all_entities.setdefault(
+                    value, placeholder.split("_", 1)[0].lstrip("<")
+                )
+
+    if show_progress:
+        print(file=sys.stderr)
+    print(f"Found {len(all_entities)} unique entities across all chunks")
 
     # Group by type
-    entity_types = {}
+    entity_types: dict[str, list[str]] = defaultdict(list)
     for value, entity_type in all_entities.items():
-        if entity_type not in entity_types:
-            entity_types[entity_type] = []
         entity_types[entity_type].append(value)
 
     # Print summary
@@ -17,77 +17,93 @@ from parameterized import parameterized
 
 # Local Imports
 from llmshield import LLMShield
-from llmshield.entity_detector import EntityType
+from llmshield.cloak_prompt import MAX_CACHED_PROMPT_LENGTH
+from llmshield.entity_detector import EntityDetector, EntityType
 from llmshield.exceptions import ValidationError
 from llmshield.utils import conversation_hash, wrap_entity
 
+# Placeholders the mock LLMs echo back, compiled once for every call
+SINGLE_BRACKET_PLACEHOLDER = re.compile(r"\[(?P<kind>PERSON|EMAIL)_\d+\]")
+DOUBLE_BRACKET_PLACEHOLDER = re.compile(
+    r"\[\[(?P<kind>PERSON|EMAIL|IP_ADDRESS|CREDIT_CARD)_\d+\]\]"
+)
+
+
+def first_placeholders(pattern: re.Pattern[str], text: str) -> dict[str, str]:
+    """Map each entity kind to its first placeholder in the text."""
+    found = {}
+    for match in pattern.finditer(text):
+        found.setdefault(match["kind"], match.group())
+    return found
+
 
 class TestCoreFunctionality(TestCase):
     """Test core functionality of LLMShield."""
 
-    def setUp(self):
-        """Set up test cases."""
-        self.start_delimiter = "["
-        self.end_delimiter = "]"
-        self.llm_func = lambda prompt: (
-            "Thanks [PERSON_0], I'll send details to [EMAIL_0]"
-        )
-        self.shield = LLMShield(
-            llm_func=self.llm_func,
-            start_delimiter=self.start_delimiter,
-            end_delimiter=self.end_delimiter,
-        )
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared (read-only) by every test.
+
+        Cloaking stores state on a shield, so tests that cloak or uncloak
+        build their own LLMShield instead of sharing one.
+        """
+        cls.start_delimiter = "["
+        cls.end_delimiter = "]"
 
         # Updated test prompt with proper spacing
-        self.test_prompt = (
+        cls.test_prompt = (
             "Hi, I'm John Doe.\n"
             "You can reach me at john.doe@example.com.\n"
             "Some numbers are 192.168.1.1 and 378282246310005\n"
         )
-        self.test_entity_map = {
+        cls.test_entity_map = {
             wrap_entity(
-                EntityType.EMAIL, 0, self.start_delimiter, self.end_delimiter
+                EntityType.EMAIL, 0, cls.start_delimiter, cls.end_delimiter
             ): "john.doe@example.com",
             wrap_entity(
-                EntityType.PERSON, 0, self.start_delimiter, self.end_delimiter
+                EntityType.PERSON, 0, cls.start_delimiter, cls.end_delimiter
             ): "John Doe",
             wrap_entity(
                 EntityType.IP_ADDRESS,
                 0,
-                self.start_delimiter,
-                self.end_delimiter,
+                cls.start_delimiter,
+                cls.end_delimiter,
             ): "192.168.1.1",
             wrap_entity(
                 EntityType.CREDIT_CARD,
                 0,
-                self.start_delimiter,
-                self.end_delimiter,
+                cls.start_delimiter,
+                cls.end_delimiter,
             ): "378282246310005",
         }
-        self.test_llm_response = (
+        cls.test_llm_response = (
             "Thanks "
-            + self.test_entity_map[
+            + cls.test_entity_map[
                 wrap_entity(
                     EntityType.PERSON,
                     0,
-                    self.start_delimiter,
-                    self.end_delimiter,
+                    cls.start_delimiter,
+                    cls.end_delimiter,
                 )
             ]
             + ", I'll send details to "
-            + self.test_entity_map[
+            + cls.test_entity_map[
                 wrap_entity(
                     EntityType.EMAIL,
                     0,
-                    self.start_delimiter,
-                    self.end_delimiter,
+                    cls.start_delimiter,
+                    cls.end_delimiter,
                 )
             ]
         )
 
     def test_cloak_sensitive_info(self):
         """Test that sensitive information is properly cloaked."""
-        cloaked_prompt, entity_map = self.shield.cloak(self.test_prompt)
+        shield = LLMShield(
+            start_delimiter=self.start_delimiter,
+            end_delimiter=self.end_delimiter,
+        )
+        cloaked_prompt, entity_map = shield.cloak(self.test_prompt)
         self.assertNotIn("john.doe@example.com", cloaked_prompt)
         self.assertNotIn("John Doe", cloaked_prompt)
         self.assertNotIn("192.168.1.1", cloaked_prompt)
@@ -96,8 +112,12 @@ class TestCoreFunctionality(TestCase):
 
     def test_uncloak(self):
         """Test that cloaked entities are properly restored."""
-        cloaked_prompt, entity_map = self.shield.cloak(self.test_prompt)
-        uncloaked = self.shield.uncloak(cloaked_prompt, entity_map)
+        shield = LLMShield(
+            start_delimiter=self.start_delimiter,
+            end_delimiter=self.end_delimiter,
+        )
+        cloaked_prompt, entity_map = shield.cloak(self.test_prompt)
+        uncloaked = shield.uncloak(cloaked_prompt, entity_map)
         self.assertEqual(
             uncloaked,
             self.test_prompt,
@@ -110,11 +130,10 @@ class TestCoreFunctionality(TestCase):
 
         def mock_llm(prompt, stream=False, **kwargs):
             """Return response echoing cloaked placeholders."""
-            person_match = re.search(r"\[PERSON_\d+\]", prompt)
-            email_match = re.search(r"\[EMAIL_\d+\]", prompt)
+            found = first_placeholders(SINGLE_BRACKET_PLACEHOLDER, prompt)
             return (
-                f"Thanks {person_match.group()}, I'll send details to "
-                f"{email_match.group()}"
+                f"Thanks {found['PERSON']}, I'll send details to "
+                f"{found['EMAIL']}"
             )
 
         shield = LLMShield(
@@ -128,7 +147,7 @@ class TestCoreFunctionality(TestCase):
         response = shield.ask(prompt=test_input)
 
         # Test the entity map - use _ for intentionally unused variable
-        _, _ = self.shield.cloak(test_input)
+        _, _ = shield.cloak(test_input)
 
         self.assertIn("John Doe", response)
         self.assertIn("john.doe@example.com", response)
@@ -214,10 +233,14 @@ class TestCoreFunctionality(TestCase):
             },
         ]
 
+        shield = LLMShield(
+            start_delimiter=self.start_delimiter,
+            end_delimiter=self.end_delimiter,
+        )
         for i, test_case in enumerate(test_cases, 1):
             input_text = test_case["input"]
             expected = test_case["expected_entities"]
-            _, entity_map = self.shield.cloak(input_text)
+            _, entity_map = shield.cloak(input_text)
 
             for entity_text, entity_type in expected.items():
                 with self.subTest(case=i, entity=entity_text):
@@ -481,17 +504,16 @@ class TestCoreFunctionality(TestCase):
         cloaked_text, _ = shield.cloak(test_text)
 
         def generator():
-            """Mock generator that yields cloaked text."""
-            yield from cloaked_text.split()
+            """Mock generator that yields cloaked text, whitespace intact."""
+            yield from (s for s in re.split(r"(\s+)", cloaked_text) if s)
 
         # Use stored entity map
         result_chunks = list(
             shield.stream_uncloak(generator(), entity_map=None)
         )
-        result = " ".join(result_chunks)
+        result = "".join(result_chunks)
 
-        expected = "Hello John Doe"
-        self.assertEqual(result, expected)
+        self.assertEqual(result, test_text)
 
     def test_stream_uncloak_error_handling(self):
         """Test error handling in stream_uncloak."""
@@ -580,25 +602,16 @@ class TestCoreFunctionality(TestCase):
             # Extract the cloaked prompt
             cloaked_prompt = kwargs.get("message") or kwargs.get("prompt", "")
 
-            # Use regex to find actual placeholders with their counters
-            person_match = re.search(r"\[\[PERSON_(\d+)\]\]", cloaked_prompt)
-            email_match = re.search(r"\[\[EMAIL_(\d+)\]\]", cloaked_prompt)
-            ip_match = re.search(r"\[\[IP_ADDRESS_(\d+)\]\]", cloaked_prompt)
-            cc_match = re.search(r"\[\[CREDIT_CARD_(\d+)\]\]", cloaked_prompt)
+            # Find actual placeholders with their counters in one scan
+            found = first_placeholders(
+                DOUBLE_BRACKET_PLACEHOLDER, cloaked_prompt
+            )
 
             # Build placeholders based on what was actually found
-            person_placeholder = (
-                person_match.group(0) if person_match else "[[PERSON_0]]"
-            )
-            email_placeholder = (
-                email_match.group(0) if email_match else "[[EMAIL_1]]"
-            )
-            ip_placeholder = (
-                ip_match.group(0) if ip_match else "[[IP_ADDRESS_2]]"
-            )
-            cc_placeholder = (
-                cc_match.group(0) if cc_match else "[[CREDIT_CARD_3]]"
-            )
+            person_placeholder = found.get("PERSON", "[[PERSON_0]]")
+            email_placeholder = found.get("EMAIL", "[[EMAIL_1]]")
+            ip_placeholder = found.get("IP_ADDRESS", "[[IP_ADDRESS_2]]")
+            cc_placeholder = found.get("CREDIT_CARD", "[[CREDIT_CARD_3]]")
 
             chunks = [
                 "Dear ",
@@ -665,6 +678,105 @@ class TestCoreFunctionality(TestCase):
         }
         self.assertEqual(final_entity_map, expected_map)
 
+    def test_cloak_repeated_prompts_get_own_maps(self):
+        """Test repeated prompts give equal results with separate maps."""
+        shield = LLMShield(prompt_cache_size=4)
+
+        first = shield.cloak(self.test_prompt)
+        second = shield.cloak(self.test_prompt)
+        self.assertEqual(first, second)
+
+        # Each call gets its own entity map to mutate
+        self.assertIsNot(first[1], second[1])
+        first[1].clear()
+        self.assertEqual(shield.cloak(self.test_prompt), second)
+
+    def test_prompt_cache_is_opt_in_and_per_instance(self):
+        """Test detection is only cached by shields that ask for it."""
+        self.assertIsNone(LLMShield()._prompt_cache)
+
+        shield = LLMShield(prompt_cache_size=4)
+        other = LLMShield(prompt_cache_size=4)
+        with patch.object(
+            EntityDetector,
+            "detect_entities",
+            autospec=True,
+            side_effect=EntityDetector.detect_entities,
+        ) as detect:
+            first = shield.cloak(self.test_prompt)
+            self.assertEqual(shield.cloak(self.test_prompt), first)
+            self.assertEqual(detect.call_count, 1)
+
+            # Existing entity maps are served from the same cache
+            shield.cloak(self.test_prompt, {})
+            self.assertEqual(detect.call_count, 1)
+
+            # Another shield does not see this shield's cache
+            other.cloak(self.test_prompt)
+            self.assertEqual(detect.call_count, 2)
+
+            # Chained shields keep the setting but start with an empty cache
+            persons_off = shield.without_persons()
+            self.assertEqual(persons_off._prompt_cache.capacity, 4)
+            persons_off.cloak(self.test_prompt)
+            self.assertEqual(detect.call_count, 3)
+
+            # Clearing drops the cached prompt and its PII
+            shield.clear_cache()
+            self.assertEqual(len(shield._prompt_cache.cache), 0)
+            shield.cloak(self.test_prompt)
+            self.assertEqual(detect.call_count, 4)
+
+    def test_prompt_cache_skips_long_prompts(self):
+        """Test prompts over the length limit are never cached."""
+        shield = LLMShield(prompt_cache_size=4)
+        long_prompt = "x" * MAX_CACHED_PROMPT_LENGTH + " john@example.com"
+
+        shield.cloak(long_prompt)
+
+        self.assertEqual(len(shield._prompt_cache.cache), 0)
+
+    @parameterized.expand(
+        [
+            ("disable_locations",),
+            ("disable_persons",),
+            ("disable_contacts",),
+            ("only_financial",),
+            ("enable_all",),
+        ]
+    )
+    def test_factories_accept_prompt_cache_size(self, factory):
+        """Test factory methods can opt into the prompt cache."""
+        self.assertIsNone(getattr(LLMShield, factory)()._prompt_cache)
+
+        shield = getattr(LLMShield, factory)(prompt_cache_size=4)
+
+        self.assertEqual(shield._prompt_cache.capacity, 4)
+
+    def test_clear_cache_drops_conversation_history(self):
+        """Test clear_cache also empties the conversation entity maps."""
+        shield = LLMShield()
+        shield._cache.put(1, {"<PERSON_0>": "John"})
+
+        shield.clear_cache()
+
+        self.assertIsNone(shield._cache.get(1))
+
+    def test_cloak_with_entity_map_extends_it(self):
+        """Test that an existing entity map is extended in place."""
+        entity_map = {"[PERSON_0]": "John Doe"}
+
+        shield = LLMShield(
+            start_delimiter=self.start_delimiter,
+            end_delimiter=self.end_delimiter,
+        )
+        cloaked, result = shield.cloak(
+            "Email jane.smith@example.com, John Doe", entity_map
+        )
+
+        self.assertIs(result, entity_map)
+        self.assertEqual(cloaked, "Email [EMAIL_1], [PERSON_0]")
+
     def test_ask_multi_turn_conversation_reuses_entities(self):
         """Test multi-turn conversation entity reuse.
 
@@ -894,6 +1006,33 @@ class TestCoreFunctionality(TestCase):
         self.assertEqual(result.name, "Alice Smith")
         self.assertEqual(result.email, "alice@example.com")
 
+    def test_uncloak_pydantic_like_instance_attribute(self):
+        """Test a model whose model_dump is set on the instance is restored.
+
+        The object satisfies PydanticLike only through its instance, so it
+        must be both accepted and uncloaked as a model.
+        """
+
+        class DuckModel:
+            """Pydantic-like model exposing model_dump per instance."""
+
+            def __init__(self, name: str):
+                """Initialise with name and an instance-level model_dump."""
+                self.name = name
+                self.model_dump = lambda: {"name": self.name}
+
+            @classmethod
+            def model_validate(cls, data: dict):
+                """Create instance from dict."""
+                return cls(data["name"])
+
+        result = LLMShield().uncloak(
+            DuckModel("<PERSON_0>"), {"<PERSON_0>": "Alice Smith"}
+        )
+
+        self.assertIsInstance(result, DuckModel)
+        self.assertEqual(result.name, "Alice Smith")
+
     @parameterized.expand(
         [
             # (description, kwargs, expected_error_fragment)
@@ -6,14 +6,15 @@ Description:
     and content extraction.
 
 Test Classes:
-    - TestDetectionUtils: Tests detection utility functions
+    - TestDetectionUtils: Tests detection utility functions, using small
+      slotted dataclass fakes instead of Mock objects
 
 Author:
     LLMShield by brainpolo, 2025-2026
 """
 
 import unittest
-from unittest.mock import Mock
+from dataclasses import dataclass, field
 
 from llmshield.detection_utils import (
     extract_anthropic_content,
@@ -24,6 +25,83 @@ from llmshield.detection_utils import (
     is_chatcompletion_like,
 )
 
+# ── Fake responses ──
+# Slotted stand-ins exposing exactly the attributes each detector probes; a
+# missing attribute is modelled by a sibling class without that field.
+
+
+@dataclass(slots=True)
+class FakeMessage:
+    """Message or streaming delta carrying content."""
+
+    content: str | None = None
+
+
+@dataclass(slots=True)
+class FakeChoice:
+    """Choice with a complete message."""
+
+    message: FakeMessage
+
+
+@dataclass(slots=True)
+class FakeStreamChoice:
+    """Streaming choice with only a delta."""
+
+    delta: FakeMessage
+
+
+@dataclass(slots=True)
+class FakeEmptyChoice:
+    """Choice with neither a message nor a delta."""
+
+
+@dataclass(slots=True)
+class FakeCompletion:
+    """ChatCompletion-like response."""
+
+    choices: list = field(default_factory=list)
+    model: str = "gpt-4"
+
+
+@dataclass(slots=True)
+class FakeChoicesOnly:
+    """Response with choices but no model."""
+
+    choices: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class FakeModelOnly:
+    """Response with a model but no choices."""
+
+    model: str = "gpt-4"
+
+
+@dataclass(slots=True)
+class FakeTextBlock:
+    """Anthropic text content block."""
+
+    text: str
+    type: str = "text"
+
+
+@dataclass(slots=True)
+class FakeAnthropicMessage:
+    """Anthropic Message-like response."""
+
+    content: str | list
+    role: str = "assistant"
+    model: str = "claude-3"
+
+
+@dataclass(slots=True)
+class FakeCohereResponse:
+    """Cohere V2-like response."""
+
+    message: FakeMessage
+    finish_reason: str = "COMPLETE"
+
 
 class TestDetectionUtils(unittest.TestCase):
     """Test detection utility functions."""
@@ -31,25 +109,16 @@ class TestDetectionUtils(unittest.TestCase):
     def test_is_chatcompletion_like_valid(self):
         """Test is_chatcompletion_like with valid objects."""
         # Valid ChatCompletion-like object
-        obj = Mock()
-        obj.choices = [Mock()]
-        obj.model = "gpt-4"
+        obj = FakeCompletion(choices=[FakeEmptyChoice()])
         self.assertTrue(is_chatcompletion_like(obj))
 
         # Empty choices still valid
-        obj = Mock()
-        obj.choices = []
-        obj.model = "gpt-4"
-        self.assertTrue(is_chatcompletion_like(obj))
+        self.assertTrue(is_chatcompletion_like(FakeCompletion(choices=[])))
 
     def test_is_chatcompletion_like_invalid(self):
         """Test is_chatcompletion_like with invalid objects."""
         # Test missing attributes
-        for attrs in [{"model": "gpt-4"}, {"choices": []}]:
-            obj = Mock(**attrs)
-            for attr in ["choices", "model"]:
-                if attr not in attrs:
-                    delattr(obj, attr)
+        for obj in [FakeModelOnly(), FakeChoicesOnly()]:
             self.assertFalse(is_chatcompletion_like(obj))
 
         # Test non-object types
@@ -59,46 +128,35 @@ class TestDetectionUtils(unittest.TestCase):
     def test_extract_chatcompletion_content_valid(self):
         """Test extract_chatcompletion_content with valid content."""
         # Regular message content
-        obj = Mock(
-            choices=[Mock(message=Mock(content="Hello world"))], model="gpt-4"
-        )
+        obj = FakeCompletion(choices=[FakeChoice(FakeMessage("Hello world"))])
         self.assertEqual(extract_chatcompletion_content(obj), "Hello world")
 
         # Streaming delta content
-        choice = Mock(delta=Mock(content="Streaming content"))
-        delattr(choice, "message")
-        obj = Mock(choices=[choice], model="gpt-4")
-        content = extract_chatcompletion_content(obj)
+        choice = FakeStreamChoice(FakeMessage("Streaming content"))
+        content = extract_chatcompletion_content(FakeCompletion([choice]))
         self.assertEqual(content, "Streaming content")
 
     def test_extract_chatcompletion_content_none(self):
         """Test extract_chatcompletion_content with None content."""
         # Test None content in both message and delta
-        for attr_name in ["message", "delta"]:
-            choice = Mock(**{attr_name: Mock(content=None)})
-            if attr_name == "delta":
-                delattr(choice, "message")
-            obj = Mock(choices=[choice], model="gpt-4")
+        for choice in [
+            FakeChoice(FakeMessage(None)),
+            FakeStreamChoice(FakeMessage(None)),
+        ]:
+            obj = FakeCompletion(choices=[choice])
             self.assertIsNone(extract_chatcompletion_content(obj))
 
     def test_extract_chatcompletion_content_invalid(self):
         """Test extract_chatcompletion_content with invalid objects."""
         test_cases = [
-            Mock(),  # Missing model attribute
-            Mock(choices=[], model="gpt-4"),  # Empty choices
-            Mock(choices=[Mock()], model="gpt-4"),  # No message/delta
+            FakeChoicesOnly(),  # Missing model attribute
+            FakeCompletion(choices=[]),  # Empty choices
+            FakeCompletion(choices=[FakeEmptyChoice()]),  # No message/delta
             "string",
             123,
             None,  # Non-object types
         ]
 
-        # Cleanup Mock objects
-        if hasattr(test_cases[0], "model"):
-            delattr(test_cases[0], "model")
-        for attr in ["message", "delta"]:
-            if hasattr(test_cases[2].choices[0], attr):
-                delattr(test_cases[2].choices[0], attr)
-
         for obj in test_cases:
             self.assertIsNone(extract_chatcompletion_content(obj))
 
@@ -118,7 +176,7 @@ class TestDetectionUtils(unittest.TestCase):
 
         message = MessageWithoutContent()
         choice = ChoiceWithMessage(message)
-        obj = Mock(choices=[choice], model="gpt-4")
+        obj = FakeCompletion(choices=[choice])
 
         content = extract_chatcompletion_content(obj)
         self.assertIsNone(content)
@@ -136,7 +194,7 @@ class TestDetectionUtils(unittest.TestCase):
 
         delta = DeltaWithoutContent()
         choice = ChoiceWithDelta(delta)
-        obj = Mock(choices=[choice], model="gpt-4")
+        obj = FakeCompletion(choices=[choice])
 
         content = extract_chatcompletion_content(obj)
         self.assertIsNone(content)
@@ -204,13 +262,7 @@ class TestDetectionUtils(unittest.TestCase):
 
     def test_extract_cohere_content_string(self):
         """Test extract_cohere_content with string content."""
-        obj = Mock()
-        obj.message = Mock()
-        obj.message.content = "Hello world"
-        obj.finish_reason = "COMPLETE"
-        del obj.choices
-        del obj.candidates
-        del obj.role
+        obj = FakeCohereResponse(message=FakeMessage("Hello world"))
         result = extract_cohere_content(obj)
         self.assertEqual(result, "Hello world")
 
@@ -235,14 +287,9 @@ class TestDetectionUtils(unittest.TestCase):
 
     def test_extract_anthropic_content_list_blocks(self):
         """Test extract_anthropic_content with list content blocks."""
-        obj = Mock()
-        obj.role = "assistant"
-        obj.model = "claude-3"
-        block = Mock()
-        block.type = "text"
-        block.text = "Hello from blocks"
-        obj.content = [block]
-        del obj.choices
+        obj = FakeAnthropicMessage(
+            content=[FakeTextBlock("Hello from blocks")]
+        )
         result = extract_anthropic_content(obj)
         self.assertEqual(result, "Hello from blocks")
 
@@ -6,18 +6,22 @@ Description:
     cache invalidation, and dictionary file loading behaviour.
 
 Test Classes:
-    - TestEntityDictionaryCache: Tests singleton cache functionality
-    - TestGetEntityCache: Tests cache retrieval function
+    - TestEntityDictionaryCacheIsolated: Tests singleton creation and
+      thread safety, each against a fresh instance
+    - TestEntityDictionaryCacheLoading: Tests dictionary properties and
+      file loading against one shared instance
 
 Author:
     LLMShield by brainpolo, 2025-2026
 """
 
 # Standard Library Imports
+import os
 import threading
 import time
 import unittest
-from unittest.mock import mock_open, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, mock_open, patch
 
 # Local Imports
 from llmshield.cache.entity_cache import (
@@ -26,9 +30,34 @@ from llmshield.cache.entity_cache import (
 )
 from llmshield.exceptions import ResourceLoadError
 
+# Thread-safety tests spawn several threads each; CI opts in to them
+FULL_TESTS = bool(os.environ.get("LLMSHIELD_FULL_TESTS"))
+SLOW_TEST_REASON = "slow thread-safety test; set LLMSHIELD_FULL_TESTS=1"
 
-class TestEntityDictionaryCache(unittest.TestCase):
-    """Test suite for EntityDictionaryCache singleton."""
+# mock_open objects keyed by file content, reused across tests
+_MOCK_FILE_CACHE: dict[str, MagicMock] = {}
+
+# Expected dictionaries, shared by the tests that load them
+_CITIES_EXPECTED = frozenset(("london", "paris", "new york"))
+_COUNTRIES_EXPECTED = frozenset(("united kingdom", "france", "canada"))
+_ORGANISATIONS_EXPECTED = frozenset(("microsoft", "google", "amazon"))
+_ENGLISH_EXPECTED = frozenset(("the", "and", "of", "to", "a"))
+_PLACES_EXPECTED = frozenset(("london", "paris", "uk", "france"))
+_COMMENTED_FILE_EXPECTED = frozenset(("item1", "item2"))
+
+
+class TestEntityDictionaryCacheIsolated(unittest.TestCase):
+    """Test suite for EntityDictionaryCache singleton behaviour."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start worker threads shared by the concurrency tests."""
+        cls._pool = ThreadPoolExecutor(max_workers=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the shared worker threads."""
+        cls._pool.shutdown()
 
     def setUp(self):
         """Reset singleton before each test."""
@@ -48,21 +77,13 @@ class TestEntityDictionaryCache(unittest.TestCase):
         # Should be the same instance
         self.assertIs(cache1, cache2)
 
+    @unittest.skipUnless(FULL_TESTS, SLOW_TEST_REASON)
     def test_thread_safety_singleton(self):
         """Test singleton thread safety."""
-        instances = []
-
-        def create_instance():
-            """Create and append an instance of EntityDictionaryCache."""
-            instances.append(EntityDictionaryCache())
-
         # Create multiple instances from different threads
-        threads = [threading.Thread(target=create_instance) for _ in range(10)]
-
-        for thread in threads:
-            thread.start()
-        for thread in threads:
-            thread.join()
+        instances = list(
+            self._pool.map(lambda _: EntityDictionaryCache(), range(10))
+        )
 
         # All instances should be the same
         for instance in instances:
@@ -87,6 +108,7 @@ class TestEntityDictionaryCache(unittest.TestCase):
         cache.__init__()
         self.assertTrue(cache._initialized)
 
+    @unittest.skipUnless(FULL_TESTS, SLOW_TEST_REASON)
     def test_double_checked_locking_race_condition(self):
         """Test race condition in double-checked locking pattern."""
         cache = EntityDictionaryCache()
@@ -107,33 +129,23 @@ class TestEntityDictionaryCache(unittest.TestCase):
         cache.__init__ = counting_init
         cache._initialized = False
 
-        threads = [threading.Thread(target=cache.__init__) for _ in range(10)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        list(self._pool.map(lambda _: cache.__init__(), range(10)))
 
         self.assertEqual(init_count, 1)
         self.assertTrue(cache._initialized)
 
+    @unittest.skipUnless(FULL_TESTS, SLOW_TEST_REASON)
     def test_init_race_condition_real(self):
         """Test real race condition in __init__ to hit line 51."""
         EntityDictionaryCache._instance = None
         barrier = threading.Barrier(5)
-        instances = []
 
-        def create_with_delay():
+        def create_with_delay(_):
             """Create instance after a barrier synchronization wait."""
             barrier.wait()
-            instances.append(EntityDictionaryCache())
+            return EntityDictionaryCache()
 
-        threads = [
-            threading.Thread(target=create_with_delay) for _ in range(5)
-        ]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        instances = list(self._pool.map(create_with_delay, range(5)))
 
         # All should be same instance
         self.assertTrue(all(inst is instances[0] for inst in instances))
@@ -155,241 +167,299 @@ class TestEntityDictionaryCache(unittest.TestCase):
 
         self.assertTrue(cache._initialized)
 
-    # skipcq: PYL-R0201
-    def _mock_resource_file(self, mock_resources, content):
-        """Mock resource file loading."""
-        mock_file = mock_open(read_data=content)
-        mock_open_return = mock_file.return_value
-        (
-            mock_resources.files.return_value.joinpath.return_value.open.return_value
-        ) = mock_open_return
+    def test_get_entity_cache_function(self):
+        """Test get_entity_cache function returns singleton."""
+        cache1 = get_entity_cache()
+        cache2 = get_entity_cache()
 
-    @patch("llmshield.error_handling.resources")
-    def test_cities_property_lazy_loading(self, mock_resources):
-        """Test cities property with lazy loading."""
-        self._mock_resource_file(mock_resources, "london\nparis\nnew york\n")
-        cache = EntityDictionaryCache()
+        # Should be the same instance
+        self.assertIs(cache1, cache2)
 
-        cities = cache.cities
-        self.assertIsInstance(cities, frozenset)
-        self.assertEqual(cities, frozenset(["london", "paris", "new york"]))
-        self.assertIs(cities, cache.cities)  # Cached
+        # Should be EntityDictionaryCache instance
+        self.assertIsInstance(cache1, EntityDictionaryCache)
 
+    @unittest.skipUnless(FULL_TESTS, SLOW_TEST_REASON)
     @patch("llmshield.error_handling.resources")
-    def test_countries_property_lazy_loading(self, mock_resources):
-        """Test countries property with lazy loading."""
-        self._mock_resource_file(
-            mock_resources, "united kingdom\nfrance\ncanada\n"
+    def test_thread_safety_lazy_loading(self, mock_resources):
+        """Test thread safety during lazy loading."""
+        original_open = mock_open(read_data="test\n")
+        arrived = threading.Semaphore(0)
+        real_lock = EntityDictionaryCache._lock
+
+        class ArrivalLock:
+            """Lock wrapper that counts the threads arriving to take it."""
+
+            def __enter__(self):
+                arrived.release()
+                return real_lock.__enter__()
+
+            def __exit__(self, *exc_info):
+                return real_lock.__exit__(*exc_info)
+
+        def blocking_open(*args, **kwargs):
+            """Mock open that loads only once every thread waits on the lock.
+
+            This holds the race window open without sleeping: the loading
+            thread keeps the lock until all five threads have passed the
+            unlocked check and queued on it.
+            """
+            for _ in range(5):
+                if not arrived.acquire(timeout=5):
+                    raise AssertionError("threads never queued on the lock")
+            return original_open.return_value
+
+        resource_open = (
+            mock_resources.files.return_value.joinpath.return_value.open
         )
+        resource_open.side_effect = blocking_open
+
         cache = EntityDictionaryCache()
+        barrier = threading.Barrier(5)
 
-        countries = cache.countries
-        self.assertIsInstance(countries, frozenset)
-        expected = frozenset(["united kingdom", "france", "canada"])
-        self.assertEqual(countries, expected)
+        def load_cities(_):
+            """Load cities from cache once every thread is ready."""
+            # Release every thread onto the lazy loader at the same moment
+            barrier.wait()
+            return cache.cities
 
-    @patch("llmshield.error_handling.resources")
-    def test_organisations_property_lazy_loading(self, mock_resources):
-        """Test organisations property with lazy loading."""
-        self._mock_resource_file(mock_resources, "microsoft\ngoogle\namazon\n")
-        cache = EntityDictionaryCache()
+        # Load cities from multiple threads simultaneously
+        with patch.object(EntityDictionaryCache, "_lock", ArrivalLock()):
+            results = list(self._pool.map(load_cities, range(5)))
 
-        organisations = cache.organisations
-        self.assertIsInstance(organisations, frozenset)
-        expected = frozenset(["microsoft", "google", "amazon"])
-        self.assertEqual(organisations, expected)
+        # The file is read once and every thread gets the same frozenset
+        self.assertEqual(resource_open.call_count, 1)
+        for result in results:
+            self.assertIs(result, results[0])
 
-    @patch("llmshield.error_handling.resources")
-    def test_english_corpus_property_lazy_loading(self, mock_resources):
-        """Test english_corpus property with lazy loading."""
-        self._mock_resource_file(mock_resources, "the\nand\nof\nto\na\n")
-        cache = EntityDictionaryCache()
 
-        corpus = cache.english_corpus
-        self.assertIsInstance(corpus, frozenset)
-        self.assertTrue({"the", "and", "of"}.issubset(corpus))
+class TestEntityDictionaryCacheLoading(unittest.TestCase):
+    """Test suite for EntityDictionaryCache properties and file loading.
 
-    @patch("llmshield.error_handling.resources")
-    def test_get_all_places(self, mock_resources):
+    These tests only need the loaded dictionaries cleared, so they share a
+    single instance rather than rebuilding the singleton for every test.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared cache instance and preload it once."""
+        EntityDictionaryCache._instance = None
+        cls.cache = EntityDictionaryCache()
+
+        # Patch resource loading once for the whole class
+        patcher = patch("llmshield.error_handling.resources")
+        cls.mock_resources = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
+        # Keep a preloaded snapshot for tests that only inspect the result
+        cls._mock_resource_file("item1\nitem2\n")
+        cls.cache.preload_all()
+        cls._preloaded = (
+            cls.cache._cities,
+            cls.cache._countries,
+            cls.cache._organisations,
+            cls.cache._english_corpus,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the shared cache instance."""
+        EntityDictionaryCache._instance = None
+
+    def setUp(self):
+        """Clear the mock and dictionaries left by the previous test."""
+        self.mock_resources.reset_mock(return_value=True, side_effect=True)
+        self.cache._cities = None
+        self.cache._countries = None
+        self.cache._organisations = None
+        self.cache._english_corpus = None
+        self.cache._all_places = None
+
+    @classmethod
+    def _mock_resource_file(cls, content):
+        """Mock resource file loading."""
+        mock_file = _MOCK_FILE_CACHE.get(content)
+        if mock_file is None:
+            mock_file = _MOCK_FILE_CACHE[content] = mock_open(
+                read_data=content
+            )
+        # Calling the mock_open rewinds the shared handle to the start of
+        # its content, so every open reads the whole file
+        (
+            cls.mock_resources.files.return_value.joinpath.return_value.open.side_effect
+        ) = mock_file
+
+    def test_all_properties_lazy_loading(self):
+        """Test each dictionary property with lazy loading."""
+        for prop_name, content, expected in (
+            ("cities", "london\nparis\nnew york\n", _CITIES_EXPECTED),
+            (
+                "countries",
+                "united kingdom\nfrance\ncanada\n",
+                _COUNTRIES_EXPECTED,
+            ),
+            (
+                "organisations",
+                "microsoft\ngoogle\namazon\n",
+                _ORGANISATIONS_EXPECTED,
+            ),
+            ("english_corpus", "the\nand\nof\nto\na\n", _ENGLISH_EXPECTED),
+        ):
+            with self.subTest(prop=prop_name):
+                self._mock_resource_file(content)
+
+                loaded = getattr(self.cache, prop_name)
+                self.assertIsInstance(loaded, frozenset)
+                self.assertEqual(loaded, expected)
+                self.assertIs(loaded, getattr(self.cache, prop_name))  # Cached
+
+    def test_get_all_places(self):
         """Test get_all_places method."""
-        self._mock_resource_file(mock_resources, "london\nparis\nuk\nfrance\n")
-        cache = EntityDictionaryCache()
+        self._mock_resource_file("london\nparis\nuk\nfrance\n")
+        cache = self.cache
 
         all_places = cache.get_all_places()
-        expected = frozenset(["london", "paris", "uk", "france"])
-        self.assertEqual(all_places, expected)
+        self.assertEqual(all_places, _PLACES_EXPECTED)
 
-    @patch("llmshield.error_handling.resources")
-    def test_is_place_method(self, mock_resources):
+        # The combined set is built once and reused
+        self.assertIs(cache.get_all_places(), all_places)
+
+    def test_is_place_method(self):
         """Test is_place method."""
-        self._mock_resource_file(mock_resources, "london\nparis\nuk\nfrance\n")
-        cache = EntityDictionaryCache()
+        self._mock_resource_file("london\nparis\nuk\nfrance\n")
+        cache = self.cache
 
-        # Test places
-        for place in ["london", "paris", "uk", "france"]:
-            self.assertTrue(cache.is_place(place))
+        # Test places in one batch; a failure shows every missed place
+        self.assertEqual(
+            frozenset(filter(cache.is_place, _PLACES_EXPECTED)),
+            _PLACES_EXPECTED,
+        )
         self.assertFalse(cache.is_place("notaplace"))
 
-    @patch("llmshield.error_handling.resources")
-    def test_is_organisation_method(self, mock_resources):
+    def test_is_organisation_method(self):
         """Test is_organisation method."""
-        self._mock_resource_file(mock_resources, "microsoft\ngoogle\n")
-        cache = EntityDictionaryCache()
+        self._mock_resource_file("microsoft\ngoogle\n")
+        cache = self.cache
 
         self.assertTrue(cache.is_organisation("microsoft"))
         self.assertTrue(cache.is_organisation("google"))
         self.assertFalse(cache.is_organisation("notanorg"))
 
-    @patch("llmshield.error_handling.resources")
-    def test_is_english_word_method(self, mock_resources):
+    def test_is_english_word_method(self):
         """Test is_english_word method."""
-        self._mock_resource_file(mock_resources, "the\nand\nof\n")
-        cache = EntityDictionaryCache()
+        self._mock_resource_file("the\nand\nof\n")
+        cache = self.cache
 
         for word in ["the", "and"]:
             self.assertTrue(cache.is_english_word(word))
         self.assertFalse(cache.is_english_word("notaword"))
 
-    @patch("llmshield.error_handling.resources")
-    def test_preload_all_method(self, mock_resources):
+    def test_preload_all_method(self):
         """Test preload_all method."""
-        self._mock_resource_file(mock_resources, "test\n")
-        cache = EntityDictionaryCache()
+        self._mock_resource_file("test\n")
+        cache = self.cache
 
         # Verify all are None initially
-        attrs = ["_cities", "_countries", "_organisations", "_english_corpus"]
-        self.assertTrue(all(getattr(cache, attr) is None for attr in attrs))
+        self.assertEqual(
+            (
+                cache._cities,
+                cache._countries,
+                cache._organisations,
+                cache._english_corpus,
+            ),
+            (None, None, None, None),
+        )
 
         cache.preload_all()
 
         # All should be loaded now
-        loaded = all(getattr(cache, attr) is not None for attr in attrs)
-        self.assertTrue(loaded)
+        self.assertEqual(
+            (
+                cache._cities,
+                cache._countries,
+                cache._organisations,
+                cache._english_corpus,
+            ),
+            (frozenset({"test"}),) * 4,
+        )
 
-    @patch("llmshield.error_handling.resources")
-    def test_get_memory_stats_empty(self, mock_resources):
+    def test_get_memory_stats_empty(self):
         """Test get_memory_stats when nothing is loaded."""
-        cache = EntityDictionaryCache()
+        cache = self.cache
         self.assertEqual(cache.get_memory_stats(), {})
 
-    @patch("llmshield.error_handling.resources")
-    def test_get_memory_stats_partial(self, mock_resources):
+    def test_get_memory_stats_partial(self):
         """Test get_memory_stats with partial loading."""
-        self._mock_resource_file(mock_resources, "item1\nitem2\nitem3\n")
-        cache = EntityDictionaryCache()
+        self._mock_resource_file("item1\nitem2\nitem3\n")
+        cache = self.cache
 
         _ = cache.cities  # Load only cities
         stats = cache.get_memory_stats()
 
         self.assertEqual(stats, {"cities": 3})
 
-    @patch("llmshield.error_handling.resources")
-    def test_get_memory_stats_full(self, mock_resources):
+    def test_get_memory_stats_full(self):
         """Test get_memory_stats with full loading."""
-        self._mock_resource_file(mock_resources, "item1\nitem2\n")
-        cache = EntityDictionaryCache()
+        cache = self.cache
+        (
+            cache._cities,
+            cache._countries,
+            cache._organisations,
+            cache._english_corpus,
+        ) = self._preloaded
 
-        cache.preload_all()
         stats = cache.get_memory_stats()
 
         # Should have all dictionaries loaded
-        expected_keys = {
-            "cities",
-            "countries",
-            "organisations",
-            "english_corpus",
-        }
-        self.assertEqual(set(stats.keys()), expected_keys)
-        self.assertEqual(len(stats), 4)
+        self.assertEqual(
+            stats,
+            {
+                "cities": 2,
+                "countries": 2,
+                "organisations": 2,
+                "english_corpus": 2,
+            },
+        )
 
-    @patch("llmshield.error_handling.resources")
-    def test_load_dict_file_with_comments(self, mock_resources):
+    def test_load_dict_file_with_comments(self):
         """Test _load_dict_file handles comments and empty lines."""
         content = "# This is a comment\nitem1\n\n# Another comment\nitem2\n\n"
-        self._mock_resource_file(mock_resources, content)
+        self._mock_resource_file(content)
 
-        cache = EntityDictionaryCache()
+        cache = self.cache
         result = cache._load_dict_file("test.txt")
 
-        self.assertEqual(result, frozenset(["item1", "item2"]))
+        self.assertEqual(result, _COMMENTED_FILE_EXPECTED)
 
-    @patch("llmshield.error_handling.resources")
-    def test_load_dict_file_file_not_found(self, mock_resources):
+    def test_load_dict_file_file_not_found(self):
         """Test _load_dict_file handles FileNotFoundError."""
         (
-            mock_resources.files.return_value.joinpath.return_value.open.side_effect
+            self.mock_resources.files.return_value.joinpath.return_value.open.side_effect
         ) = FileNotFoundError("File not found")
 
-        cache = EntityDictionaryCache()
+        cache = self.cache
 
         with self.assertRaises(ResourceLoadError) as context:
             cache._load_dict_file("missing.txt")
 
-        self.assertIn(
-            "Resource not found",
-            str(context.exception),
-        )
+        message = str(context.exception)
+        self.assertIn("Resource not found", message)
+        self.assertIn("missing.txt", message)
 
-    @patch("llmshield.error_handling.resources")
-    def test_load_dict_file_unicode_error(self, mock_resources):
+    def test_load_dict_file_unicode_error(self):
         """Test _load_dict_file handles UnicodeDecodeError."""
         unicode_error = UnicodeDecodeError("utf-8", b"", 0, 1, "invalid byte")
         (
-            mock_resources.files.return_value.joinpath.return_value.open.side_effect
+            self.mock_resources.files.return_value.joinpath.return_value.open.side_effect
         ) = unicode_error
 
-        cache = EntityDictionaryCache()
+        cache = self.cache
 
         with self.assertRaises(ResourceLoadError) as context:
             cache._load_dict_file("bad_encoding.txt")
 
+        self.assertIs(context.exception.__cause__, unicode_error)
         self.assertIn("bad_encoding.txt", str(context.exception))
 
-    def test_get_entity_cache_function(self):
-        """Test get_entity_cache function returns singleton."""
-        cache1 = get_entity_cache()
-        cache2 = get_entity_cache()
-
-        # Should be the same instance
-        self.assertIs(cache1, cache2)
-
-        # Should be EntityDictionaryCache instance
-        self.assertIsInstance(cache1, EntityDictionaryCache)
-
-    @patch("llmshield.error_handling.resources")
-    def test_thread_safety_lazy_loading(self, mock_resources):
-        """Test thread safety during lazy loading."""
-        # Mock to add delay and test race conditions
-        original_open = mock_open(read_data="test\n")
-
-        def delayed_open(*args, **kwargs):
-            """Mock open with a small delay to test race conditions."""
-            time.sleep(0.1)  # Small delay to increase chance of race condition
-            return original_open.return_value
-
-        (
-            mock_resources.files.return_value.joinpath.return_value.open.side_effect
-        ) = delayed_open
-
-        cache = EntityDictionaryCache()
-        results = []
-
-        def load_cities():
-            """Load cities from cache into the results list."""
-            results.append(cache.cities)
-
-        # Start multiple threads trying to load cities simultaneously
-        threads = [threading.Thread(target=load_cities) for _ in range(5)]
-
-        for thread in threads:
-            thread.start()
-        for thread in threads:
-            thread.join()
-
-        # All threads should get the same frozenset instance
-        for result in results:
-            self.assertIs(result, results[0])
-
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -14,11 +14,13 @@ import unittest
 from parameterized import parameterized
 
 from llmshield.entity_detector import (
+    ENT_REPLACEMENT,
     Entity,
     EntityConfig,
     EntityDetector,
     EntityGroup,
     EntityType,
+    _mask_spans,
 )
 
 
@@ -196,7 +198,7 @@ class TestProperNounCollection(unittest.TestCase):
         result = self.detector._collect_proper_nouns(text)
         for name in expected_names:
             self.assertTrue(
-                any(name in entity for entity in result),
+                any(name in entity for _, entity in result),
                 f"Expected '{name}' in {result} for: {description}",
             )
 
@@ -206,7 +208,22 @@ class TestProperNounCollection(unittest.TestCase):
             "Dr. Smith and Ms. Johnson"
         )
         for name in ("Dr", "Smith", "Ms", "Johnson"):
-            self.assertIn(name, proper_nouns)
+            self.assertIn(name, [p_noun for _, p_noun in proper_nouns])
+
+    def test_collect_proper_nouns_spans(self):
+        """Test proper nouns are collected in order with original spans."""
+        text = "I met Alice  and Bob.\nThen Carol Jones"
+        proper_nouns = self.detector._collect_proper_nouns(text)
+        self.assertEqual(
+            proper_nouns,
+            [
+                ((6, 11), "Alice"),
+                ((17, 20), "Bob"),
+                ((22, 38), "Then Carol Jones"),
+            ],
+        )
+        for (start, end), p_noun in proper_nouns:
+            self.assertEqual(text[start:end], p_noun)
 
     def test_detect_proper_nouns_no_classification(self):
         """Test proper nouns when all words are lowercase."""
@@ -393,6 +410,8 @@ class TestPlaceDetection(unittest.TestCase):
         [
             ("major_city", "New York", True),
             ("world_city", "London", True),
+            ("uppercase_city", "LONDON", True),
+            ("country", "France", True),
             ("non_place", "Not A Place", False),
             ("street_component", "Main Street", True),
             ("avenue_component", "Oak Avenue", True),
@@ -501,15 +520,21 @@ class TestNumberDetection(unittest.TestCase):
         self.assertEqual(len(phone_entities), 1)
         self.assertEqual(phone_entities[0].value, "+1 (555) 123-4567")
 
-    def test_email_detection_in_numbers_method(self):
-        """Test email is detected during number phase."""
+    def test_email_left_to_locator_phase(self):
+        """Test emails are detected once, by the locator phase only."""
         entities, reduced = self.detector._detect_numbers(
             "Contact john@example.com for details"
         )
-        email_entities = [e for e in entities if e.type == EntityType.EMAIL]
-        self.assertEqual(len(email_entities), 1)
-        self.assertEqual(email_entities[0].value, "john@example.com")
-        self.assertNotIn("john@example.com", reduced)
+        self.assertEqual(entities, set())
+        self.assertIn("john@example.com", reduced)
+
+        entities = self.detector.detect_entities(
+            "write to john@example.com for details"
+        )
+        self.assertEqual(
+            entities,
+            {Entity(type=EntityType.EMAIL, value="john@example.com")},
+        )
 
 
 class TestLocatorDetection(unittest.TestCase):
@@ -525,6 +550,74 @@ class TestLocatorDetection(unittest.TestCase):
         self.assertEqual(len(entities), 0)
         self.assertEqual(text, "")
 
+    def test_digits_inside_url_not_phone(self):
+        """Test a number inside a URL is not also reported as a phone."""
+        entities = self.detector.detect_entities(
+            "See https://example.com/calls/555-123-4567 today"
+        )
+        self.assertEqual(
+            {e.type for e in entities},
+            {EntityType.URL},
+        )
+
+    def test_phone_before_ip_does_not_swallow_it(self):
+        """Test a phone number directly before an IP leaves the IP whole."""
+        entities = self.detector.detect_entities(
+            "Reach +44 84491234567 192.168.1.1"
+        )
+        self.assertEqual(
+            entities,
+            {
+                Entity(type=EntityType.PHONE, value="+44 84491234567"),
+                Entity(type=EntityType.IP_ADDRESS, value="192.168.1.1"),
+            },
+        )
+
+
+class TestSpanMasking(unittest.TestCase):
+    """Test masking of detected entity spans."""
+
+    def setUp(self):
+        """Initialise detector for each test."""
+        self.detector = EntityDetector()
+
+    def test_mask_spans(self):
+        """Test spans are replaced in a single pass."""
+        self.assertEqual(
+            _mask_spans("abc def ghi", [(0, 3), (8, 11)]),
+            f"{ENT_REPLACEMENT} def {ENT_REPLACEMENT}",
+        )
+        self.assertEqual(_mask_spans("abc", []), "abc")
+
+    def test_repeated_entities_all_masked(self):
+        """Test every occurrence of a detected entity is masked."""
+        _, reduced = self.detector._detect_locators(
+            "Mail a.b@example.com, then a.b@example.com again"
+        )
+        self.assertNotIn("example.com", reduced)
+        self.assertEqual(reduced.count(ENT_REPLACEMENT), 2)
+
+    def test_nested_proper_nouns_masked(self):
+        """Test longer proper nouns are masked before shorter ones."""
+        entities, reduced = self.detector._detect_proper_nouns(
+            "Rajesh Krishnamurthy thanked Krishnamurthy"
+        )
+        values = {e.value for e in entities}
+        self.assertEqual(values, {"Rajesh Krishnamurthy", "Krishnamurthy"})
+        self.assertEqual(
+            reduced, f"{ENT_REPLACEMENT} thanked {ENT_REPLACEMENT}"
+        )
+
+    def test_only_candidate_spans_masked(self):
+        """Test proper nouns are not masked inside other words."""
+        entities, reduced = self.detector._detect_proper_nouns(
+            "we visited Paris and the eParis site"
+        )
+        self.assertEqual(entities, {Entity(EntityType.PLACE, "Paris")})
+        self.assertEqual(
+            reduced, f"we visited {ENT_REPLACEMENT} and the eParis site"
+        )
+
 
 class TestEntityConfig(unittest.TestCase):
     """Test entity configuration and selective filtering."""
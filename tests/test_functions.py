@@ -0,0 +1,49 @@
+"""Test function-based matchers.
+
+Description:
+    This test module covers the validation functions used during entity
+    detection, currently the Luhn checksum for credit card numbers.
+
+Test Classes:
+    - TestLuhnCheck: Tests Luhn checksum validation
+
+Author: LLMShield by brainpolo, 2025-2026
+"""
+
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from llmshield.matchers.functions import _luhn_check
+
+
+class TestLuhnCheck(TestCase):
+    """Test suite for the Luhn checksum."""
+
+    @parameterized.expand(
+        [
+            # Valid card numbers
+            ("visa", "4111111111111111", True),
+            ("amex", "378282246310005", True),
+            ("mastercard", "5555555555554444", True),
+            ("discover", "6011000990139424", True),
+            ("with_spaces", "4111 1111 1111 1111", True),
+            ("with_dashes", "5555-5555-5555-4444", True),
+            # Invalid card numbers
+            ("off_by_one", "4111111111111112", False),
+            ("sequential", "1234567890123456", False),
+            # Degenerate input
+            ("single_zero", "0", True),
+            ("no_digits", "card", False),
+            ("empty", "", False),
+        ]
+    )
+    def test_luhn_check(self, description, card_number, expected):
+        """Test Luhn validation - parameterized."""
+        self.assertEqual(_luhn_check(card_number), expected)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main(verbosity=2)
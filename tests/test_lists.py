@@ -0,0 +1,29 @@
+"""Test list-based matchers.
+
+Description:
+    This test module checks the static word lists used during entity
+    detection, guarding against duplicated entries in the ordered lists.
+
+Test Classes:
+    - TestMatcherLists: Tests the matcher word lists
+
+Author: LLMShield by brainpolo, 2025-2026
+"""
+
+from unittest import TestCase
+
+from llmshield.matchers.lists import EN_PUNCTUATION
+
+
+class TestMatcherLists(TestCase):
+    """Test suite for the matcher word lists."""
+
+    def test_punctuation_has_no_duplicates(self):
+        """Test every punctuation entry appears exactly once."""
+        self.assertEqual(len(set(EN_PUNCTUATION)), len(EN_PUNCTUATION))
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main(verbosity=2)
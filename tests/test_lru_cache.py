@@ -34,6 +34,15 @@ class TestLRUCache(TestCase):
         self.assertEqual(cache.get("b"), 2)
         self.assertEqual(len(cache.cache), 2)
 
+    def test_clear(self):
+        """Test clear removes every item."""
+        cache: LRUCache[str, int] = LRUCache(capacity=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache.cache), 0)
+
     def test_get_nonexistent_key(self):
         """Test getting a non-existent key returns None."""
         cache: LRUCache[str, int] = LRUCache(capacity=2)
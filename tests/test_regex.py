@@ -19,6 +19,8 @@ from llmshield.matchers.regex import (
     CREDIT_CARD_PATTERN,
     EMAIL_ADDRESS_PATTERN,
     IP_ADDRESS_PATTERN,
+    LOCATOR_PATTERN,
+    NUMBER_PATTERN,
     PHONE_NUMBER_PATTERN,
     URL_PATTERN,
 )
@@ -212,6 +214,35 @@ class TestRegexMatchers(TestCase):
         else:
             self.assertIsNone(match, f"URL should not match: {url}")
 
+    @parameterized.expand(
+        [
+            ("locator_url", LOCATOR_PATTERN, "https://example.com", "URL"),
+            ("locator_email", LOCATOR_PATTERN, "john@example.com", "EMAIL"),
+            ("locator_ip", LOCATOR_PATTERN, "192.168.1.1", "IP_ADDRESS"),
+            (
+                "number_credit_card",
+                NUMBER_PATTERN,
+                "378282246310005",
+                "CREDIT_CARD",
+            ),
+            ("number_phone", NUMBER_PATTERN, "+1 (555) 123-4567", "PHONE"),
+        ]
+    )
+    def test_combined_patterns_dispatch(
+        self, description, pattern, value, expected_group
+    ):
+        """Test combined patterns report the matching group name."""
+        match = pattern.search(f"Details: {value} end")
+        self.assertIsNotNone(match, f"{value} should match")
+        self.assertEqual(match.group(), value)
+        self.assertEqual(match.lastgroup, expected_group)
+
+    def test_combined_pattern_single_pass(self):
+        """Test one scan finds every locator in order without overlap."""
+        text = "See https://example.com, mail a.b@example.org or 10.0.0.1"
+        groups = [m.lastgroup for m in LOCATOR_PATTERN.finditer(text)]
+        self.assertEqual(groups, ["URL", "EMAIL", "IP_ADDRESS"])
+
 
 if __name__ == "__main__":
     import unittest
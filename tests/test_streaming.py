@@ -81,6 +81,45 @@ class TestStreamUncloaking(unittest.TestCase):
         result = list(uncloak_stream_response(mock_stream(), self.entity_map))
         self.assertEqual(result, ["<PERSON_incomplete and then regular text"])
 
+    def test_unterminated_delimiter_is_not_held(self):
+        """Test a literal start delimiter does not hold back the stream."""
+
+        def mock_stream():
+            """Yield text with a start delimiter that never closes."""
+            yield "x < y is true"
+            yield " and so on"
+
+        result = list(uncloak_stream_response(mock_stream(), self.entity_map))
+        self.assertEqual(result, ["x ", "< y is true", " and so on"])
+
+    def test_literal_delimiter_before_placeholder(self):
+        """Test a placeholder after a literal start delimiter is uncloaked."""
+
+        def mock_stream():
+            """Yield a literal delimiter followed by a placeholder."""
+            yield "if a < b then <PERSON_0> wins"
+
+        result = list(uncloak_stream_response(mock_stream(), self.entity_map))
+        self.assertEqual("".join(result), "if a < b then John wins")
+
+    def test_min_chunk_size_coalesces_output(self):
+        """Test small uncloaked pieces are joined into larger chunks."""
+        min_chunk_size = 8
+
+        def mock_stream():
+            """Yield tiny chunks, one placeholder split across three."""
+            yield from ["Hi ", "<PER", "SON", "_0>", ", ", "bye", " now", "!"]
+
+        result = list(
+            uncloak_stream_response(
+                mock_stream(), self.entity_map, min_chunk_size=min_chunk_size
+            )
+        )
+
+        self.assertEqual("".join(result), "Hi John, bye now!")
+        self.assertTrue(all(len(c) >= min_chunk_size for c in result[:-1]))
+        self.assertEqual(result, ["Hi John, ", "bye now!"])
+
     def test_placeholder_at_end_of_stream(self):
         """Test placeholder that completes at the very end."""
 
@@ -11,11 +11,18 @@ Test Classes:
 Author: LLMShield by brainpolo, 2025-2026
 """
 
+import sys
 import unittest
+from collections import OrderedDict
+from unittest.mock import patch
 
 from parameterized import parameterized
 
-from llmshield.uncloak_response import _uncloak_response
+from llmshield.uncloak_response import (
+    _placeholder_pattern,
+    _Substitutor,
+    _uncloak_response,
+)
 
 
 class MockChatCompletion:
@@ -79,6 +86,85 @@ class TestUncloakResponse(unittest.TestCase):
         expected = "Hello John Doe, email me at john@example.com"
         self.assertEqual(result, expected)
 
+    def test_uncloak_string_single_pass(self):
+        """Test restored values are not rescanned for placeholders."""
+        entity_map = {
+            "[PERSON_1]": "literal [PERSON_10] text",
+            "[PERSON_10]": "Jane",
+        }
+        result = _uncloak_response("[PERSON_1] and [PERSON_10]", entity_map)
+        self.assertEqual(result, "literal [PERSON_10] text and Jane")
+
+    def test_uncloak_reuses_compiled_pattern(self):
+        """Test the pattern is compiled once per set of placeholders."""
+        _placeholder_pattern.cache_clear()
+        other_values = dict.fromkeys(self.entity_map, "X")
+
+        first = _uncloak_response("Hi <PERSON_0>", self.entity_map)
+        second = _uncloak_response("Hi <PERSON_0>", other_values)
+
+        # Same placeholders share the pattern, values come from each map
+        self.assertEqual((first, second), ("Hi John Doe", "Hi X"))
+        self.assertEqual(_placeholder_pattern.cache_info().misses, 1)
+        self.assertEqual(_placeholder_pattern.cache_info().hits, 1)
+
+    def test_uncloak_structure_looks_up_pattern_once(self):
+        """Test all strings in a structure share one substitution setup."""
+        _placeholder_pattern.cache_clear()
+        response = {"a": ["<PERSON_0>", {"b": "<EMAIL_0>"}], "c": "<PLACE_0>"}
+
+        result = _uncloak_response(response, self.entity_map)
+
+        self.assertEqual(result["a"][1], {"b": "john@example.com"})
+        info = _placeholder_pattern.cache_info()
+        self.assertEqual(info.hits + info.misses, 1)
+
+    def test_substitutor_skips_text_without_prefix(self):
+        """Test text lacking the shared placeholder prefix is not scanned."""
+        substitutor = _Substitutor(self.entity_map)
+        self.assertEqual(substitutor.prefix, "<")
+
+        with patch.object(substitutor, "pattern") as pattern:
+            self.assertEqual(
+                substitutor.sub("no placeholders"), "no placeholders"
+            )
+        pattern.sub.assert_not_called()
+
+    def test_uncloak_copies_only_changed_containers(self):
+        """Test unchanged subtrees are shared rather than rebuilt."""
+        unchanged = {"ids": [1, 2, 3], "note": "no placeholders"}
+        response = {"user": ["<PERSON_0>", 42], "meta": unchanged}
+
+        result = _uncloak_response(response, self.entity_map)
+
+        self.assertEqual(result["user"], ["John Doe", 42])
+        self.assertIs(result["meta"], unchanged)
+        self.assertIs(_uncloak_response(unchanged, self.entity_map), unchanged)
+        # The input itself is never modified
+        self.assertEqual(response["user"], ["<PERSON_0>", 42])
+
+    def test_uncloak_builtin_subclasses(self):
+        """Test subclasses of str, list and dict are still uncloaked."""
+
+        class Text(str):
+            """String subclass."""
+
+        class Tags(list):
+            """List subclass."""
+
+        response = OrderedDict(
+            name=Text("<PERSON_0>"), tags=Tags(["<EMAIL_0>"])
+        )
+
+        result = _uncloak_response(response, self.entity_map)
+
+        self.assertEqual(
+            result, {"name": "John Doe", "tags": ["john@example.com"]}
+        )
+        self.assertEqual(
+            _uncloak_response(Text("<PLACE_0>"), self.entity_map), "New York"
+        )
+
     def test_uncloak_list_response(self):
         """Test uncloaking list response."""
         response = [
@@ -310,6 +396,20 @@ class TestUncloakResponse(unittest.TestCase):
 
         self.assertEqual(result, expected)
 
+    def test_uncloak_deeply_nested_structure(self):
+        """Test nesting deeper than the recursion limit is uncloaked."""
+        depth = sys.getrecursionlimit() * 2
+        response = ["<PERSON_0>"]
+        for _ in range(depth):
+            response = [response, {"city": "<PLACE_0>"}]
+
+        result = _uncloak_response(response, self.entity_map)
+
+        for _ in range(depth):
+            self.assertEqual(result[1], {"city": "New York"})
+            result = result[0]
+        self.assertEqual(result, ["John Doe"])
+
     def test_uncloak_preserves_object_structure(self):
         """Test that uncloaking preserves the original object structure."""
         # Create a complex ChatCompletion-like object
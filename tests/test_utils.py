@@ -23,6 +23,7 @@ from llmshield.utils import (
     _should_cloak_input,
     ask_helper,
     conversation_hash,
+    is_pydantic_like,
     is_valid_delimiter,
     is_valid_stream_response,
     normalise_spaces,
@@ -87,6 +88,11 @@ class TestNormaliseSpaces(unittest.TestCase):
             ),
             ("empty_string", "", ""),
             ("only_whitespace", "   \t\n   ", ""),
+            (
+                "unicode_whitespace",
+                "Hello\u00a0\u2003world\u3000",
+                "Hello world",
+            ),
         ]
     )
     def test_normalise_spaces(self, description, text, expected):
@@ -161,6 +167,14 @@ class TestWrapEntity(unittest.TestCase):
             wrap_entity(entity_type, suffix, start, end), expected
         )
 
+    def test_wrap_entity_is_cached(self):
+        """Test repeated wraps reuse the same placeholder string."""
+        first = wrap_entity(EntityType.PERSON, 7, "<", ">")
+        self.assertIs(wrap_entity(EntityType.PERSON, 7, "<", ">"), first)
+        self.assertEqual(
+            wrap_entity(EntityType.EMAIL, 7, "<", ">"), "<EMAIL_7>"
+        )
+
 
 class TestIsValidStreamResponse(unittest.TestCase):
     """Test stream response validation."""
@@ -265,6 +279,8 @@ class TestPydanticLikeProtocol(unittest.TestCase):
         Model = type("Model", (), attrs)
         result = isinstance(Model(), PydanticLike)
         self.assertEqual(result, should_match)
+        # The helper used by uncloak must agree with the protocol
+        self.assertEqual(is_pydantic_like(Model()), should_match)
 
 
 class TestConversationHash(unittest.TestCase):